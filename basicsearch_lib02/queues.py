@@ -1,89 +1,189 @@
-'''
-Queues: Stack, FIFOQueue, PriorityQueue
-'''
-
-import collections  # data containers
-import bisect   # efficient sorted lists
-
-class Queue:
-
-    """Queue is an abstract class/interface. There are three types:
-        Stack(): A Last In First Out Queue.
-        FIFOQueue(): A First In First Out Queue.
-        PriorityQueue(order, f): Queue in sorted order (default min-first).
-    Each type supports the following methods and functions:
-        q.append(item)  -- add an item to the queue
-        q.extend(items) -- equivalent to: for item in items: q.append(item)
-        q.pop()         -- return the top item from the queue
-        len(q)          -- number of items in q (also q.__len())
-        item in q       -- does q contain item?
-    Note that isinstance(Stack(), Queue) is false, because we implement stacks
-    as lists.  If Python ever gets interfaces, Queue will be an interface."""
-
-    def __init__(self):
-        raise NotImplementedError
-
-    def extend(self, items):
-        # append each item
-        for item in items:
-            self.append(item)
-
-
-class PriorityQueue(Queue):
-
-    """A queue in which the minimum (or maximum) element (as determined by f and
-    order) is returned first. If order is min, the item with minimum f(x) is
-    returned first; if order is max, then it is the item with maximum f(x).
-    Also supports dict-like lookup."""
-
-    def __init__(self, order=min, f=lambda x: x):
-        """
-        PriorityQueue
-        :param order: Function used for ordering min/max
-        :param f: Function applied to inserted nodes to determine f
-        """
-        self.A = []
-        self.order = order
-        self.f = f
-
-    def append(self, item):
-        """
-        append(item)
-        :param item:  Search state to add
-        :return: None
-        """
-        bisect.insort(self.A, (self.f(item), item))
-
-    def __len__(self):
-        """
-        len()
-        :return: Number of items in queue
-        """
-        return len(self.A)
-
-    def pop(self):
-        """
-        pop() - dequeue an item
-        :return:  node with minimum or maximum f value depending on order
-        """
-        if self.order == min:
-            return self.A.pop(0)[1]
-        else:
-            return self.A.pop()[1]
-
-    def __contains__(self, item):
-        # Implementation of in
-        return any(item == pair[1] for pair in self.A)
-
-    def __getitem__(self, key):
-        # Support retrieval by indexing
-        for _, item in self.A:
-            if item == key:
-                return item
-
-    def __delitem__(self, key):
-        # Support deletion by indexing, e.g. del queue[key]
-        for i, (value, item) in enumerate(self.A):
-            if item == key:
-                self.A.pop(i)
-
+'''
+Queues: Stack, FIFOQueue, PriorityQueue
+'''
+
+import collections  # data containers
+
+class Queue:
+
+    """Queue is an abstract class/interface. There are three types:
+        Stack(): A Last In First Out Queue.
+        FIFOQueue(): A First In First Out Queue.
+        PriorityQueue(order, f): Queue in sorted order (default min-first).
+    Each type supports the following methods and functions:
+        q.append(item)  -- add an item to the queue
+        q.extend(items) -- equivalent to: for item in items: q.append(item)
+        q.pop()         -- return the top item from the queue
+        len(q)          -- number of items in q (also q.__len())
+        item in q       -- does q contain item?
+    Note that isinstance(Stack(), Queue) is false, because we implement stacks
+    as lists.  If Python ever gets interfaces, Queue will be an interface."""
+
+    def __init__(self):
+        raise NotImplementedError
+
+    def extend(self, items):
+        # append each item
+        for item in items:
+            self.append(item)
+
+
+class PriorityQueue(Queue):
+
+    """A queue in which the minimum (or maximum) element (as determined by f and
+    order) is returned first. If order is min, the item with minimum f(x) is
+    returned first; if order is max, then it is the item with maximum f(x).
+    Items with equal f values are returned in the order they were appended.
+    Also supports dict-like lookup.
+
+    Implemented as a binary heap with an index from each queued item to its
+    heap position, so append, pop, deletion and decrease-key are O(log n) and
+    membership and lookup are O(1).  Items must be hashable; an item equal to
+    one already queued replaces it only if it has a better priority.
+
+    If a key function is given, items are indexed, compared for equality
+    and looked up by key(item) instead, e.g. by a canonical form of their
+    state."""
+
+    def __init__(self, order=min, f=lambda x: x, key=None):
+        """
+        PriorityQueue
+        :param order: Function used for ordering min/max
+        :param f: Function applied to inserted nodes to determine f
+        :param key: Optional function giving the index key of an item
+        """
+        self.A = []  # heap of [priority, insertion count, item, key] entries
+        self.index = {}  # key -> position of its entry in A
+        self.order = order
+        self.f = f
+        self.key = key
+        self.count = 0  # insertion counter, breaks ties in priority
+
+    def _before(self, a, b):
+        "_before(a, b) - True if heap entry a is to be dequeued before b"
+        if self.order == min:
+            if a[0] < b[0]:
+                return True
+            if b[0] < a[0]:
+                return False
+        else:
+            if b[0] < a[0]:
+                return True
+            if a[0] < b[0]:
+                return False
+        # Equal priority, first in first out
+        return a[1] < b[1]
+
+    def _place(self, pos, entry):
+        "_place(pos, entry) - store entry in heap slot pos and index it"
+        self.A[pos] = entry
+        self.index[entry[3]] = pos
+
+    def _sift_up(self, pos):
+        "_sift_up(pos) - move entry at pos toward the root until ordered"
+        entry = self.A[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not self._before(entry, self.A[parent]):
+                break
+            self._place(pos, self.A[parent])
+            pos = parent
+        self._place(pos, entry)
+
+    def _sift_down(self, pos):
+        "_sift_down(pos) - move entry at pos toward the leaves until ordered"
+        entry = self.A[pos]
+        size = len(self.A)
+        child = 2 * pos + 1
+        while child < size:
+            # pick the child that comes first
+            right = child + 1
+            if right < size and self._before(self.A[right], self.A[child]):
+                child = right
+            if not self._before(self.A[child], entry):
+                break
+            self._place(pos, self.A[child])
+            pos = child
+            child = 2 * pos + 1
+        self._place(pos, entry)
+
+    def _remove(self, pos):
+        "_remove(pos) - remove and return the entry at heap position pos"
+        entry = self.A[pos]
+        del self.index[entry[3]]
+        last = self.A.pop()
+        if pos < len(self.A):
+            # fill the hole with the last entry and restore heap order
+            self.A[pos] = last
+            self.index[last[3]] = pos
+            self._sift_up(pos)
+            self._sift_down(self.index[last[3]])
+        return entry
+
+    def append(self, item):
+        """
+        append(item)
+        :param item:  Search state to add
+        :return: None
+        """
+        key = item if self.key is None else self.key(item)
+        entry = [self.f(item), self.count, item, key]
+        self.count += 1
+        pos = self.index.get(key)
+        if pos is None:
+            self.A.append(entry)
+            self._sift_up(len(self.A) - 1)
+        elif self._before(entry, self.A[pos]):
+            # Decrease key, keep the better of the two equal items
+            del self.index[self.A[pos][3]]
+            self._place(pos, entry)
+            self._sift_up(pos)
+
+    def __len__(self):
+        """
+        len()
+        :return: Number of items in queue
+        """
+        return len(self.A)
+
+    def pop(self):
+        """
+        pop() - dequeue an item
+        :return:  node with minimum or maximum f value depending on order
+        """
+        if not self.A:
+            raise IndexError("pop from empty PriorityQueue")
+        return self._remove(0)[2]
+
+    def peek(self):
+        """
+        peek() - item that pop() would return, without removing it
+        :return:  node with minimum or maximum f value depending on order
+        """
+        if not self.A:
+            raise IndexError("peek into empty PriorityQueue")
+        return self.A[0][2]
+
+    def __iter__(self):
+        # Queued items, in no particular order
+        return (entry[2] for entry in self.A)
+
+    def __contains__(self, item):
+        # Implementation of in
+        return (item if self.key is None else self.key(item)) in self.index
+
+    def __getitem__(self, key):
+        # Support retrieval by indexing, None if not queued
+        if self.key is not None:
+            key = self.key(key)
+        pos = self.index.get(key)
+        if pos is not None:
+            return self.A[pos][2]
+
+    def __delitem__(self, key):
+        # Support deletion by indexing, e.g. del queue[key]
+        if self.key is not None:
+            key = self.key(key)
+        pos = self.index.get(key)
+        if pos is not None:
+            self._remove(pos)
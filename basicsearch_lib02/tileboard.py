@@ -1,242 +1,492 @@
-import random
-import copy
-import math
-
-from basicsearch_lib02.board import Board
-
-
-class TileBoard(Board):
-    def __init__(self, n, multiple_solutions=False, force_state=None,
-                 verbose=False):
-        """"TileBoard(n, multiple_solutions, force_state)
-        Create a tile board for an n puzzle.
-        
-        If multipleSolutions is true, the solution need not
-        be in the bottom right.  This defaults to False but
-        is automatically set to True when there is no middle square 
-        
-        force_state can be used to initialize an n puzzle to a desired
-        configuration.  No error checking is done.  It is specified as
-        a list with n+1 elements in it, 1:n and None in the desired order.
-        """
-        
-        self.verbose = verbose
-        
-
-        self.boardsize = int(math.sqrt(n+1))  
-        if math.sqrt(n+1) != self.boardsize:
-            raise ValueError("Bad board size\n" +
-                "Must be one less than an odd perfect square 8, 24, ...")
-
-        # initialize parent
-        super().__init__(self.boardsize, self.boardsize)
-
-
-        # Compute solution states
-        if multiple_solutions:
-            # Create list of goals [(None, 1, 2, 3, ..), (1, None, 2, 3, ...),
-            #                        (1, 2, None, 3, ...), ...]
-            self.goals = []
-            for hole_position in range(n+1):
-                solution = []
-                # Add numbers 1 to n, placing a None at current hole_position
-                for idx in range(n+1):
-                    if idx < hole_position:
-                        solution.append(idx+1)
-                    elif idx == hole_position:
-                        solution.append(None)
-                    else:
-                        solution.append(idx)
-                self.goals.append(tuple(solution))
-
-        else:
-            # Single goal, hole in last position [(1, 2, 3, ..., None)]
-            self.goals = [tuple([None if idx == n else idx+1
-                                     for idx in range(n+1)])]
-
-        if force_state:
-            tiles = force_state
-            if not self.solvable(tiles):
-                raise ValueError("Puzzle is not solvable")
-        else:
-            # Build initial state - all in order
-            tiles = [val+1 for val in range(n)]
-            tiles.append(None)
-            # Verify problem is solvable
-            done = False
-            while not done:
-                random.shuffle(tiles)  # mix up tiles
-                done = self.solvable(tiles)
-
-        # populate the board with our tile order
-        for r in range(self.boardsize):
-            for c in range(self.boardsize):
-                tile = tiles[r*self.boardsize + c]  # next tile
-                if tile:                    
-                    self.place(r, c, tile)
-                else:
-                    # keep track of empty tile
-                    self.empty = (r, c)
-    
-    def solvable(self, tiles, verbose=False):
-        """solvable - Determines if a puzzle is solvable
-
-            Given a list of tiles, determine if the N-puzzle is solvable.
-            You do not need to know how to do this, but the calculation
-            is based on the inversion order.
-
-            for each number in the list of tiles,
-               How many following numbers are less than that one
-               e.g. [13, 10, 11, 6, 5, 7, 4, 8, 1, 12, 14, 9, 3, 15, 2, None]
-               Example:  Files following 9:  [3, 15, 2, None]
-               Two of these are smaller than 9, so the inversion order
-                   for 9 is 2
-
-            A puzzle's inversion order is the sum of the tile inversion
-            orders.  For puzzles with even numbers of rows and columns,
-            the row number on which the blank resides must be added.
-            Note that we need not worry about 1 as there are
-            no tiles smaller than one.
-
-            See Wolfram Mathworld for further explanation:
-                http://mathworld.wolfram.com/15Puzzle.html
-            and http://www.cut-the-knot.org/pythagoras/fifteen.shtml
-
-            This lets us know if a problem can be solved.  The inversion
-            order modulo 2 is invariant across moves.  This means that
-            when we make a legal move, the inversion order will always
-            be even or odd.  The solution state always has an even
-            inversion order, so any puzzle with an odd inversion
-            number cannot be solved.
-        """
-
-        inversionorder = 0
-        # Make life easy, remove None
-        reduced = [t for t in tiles if t is not None]
-        # Loop over all but last (no tile after it)
-        for idx in range(len(reduced)-1):
-            value = reduced[idx]
-            after = reduced[idx+1:]  # Remaining tiles
-            smaller = [x for x in after if x < value]
-            numtiles = len(smaller)
-            inversionorder = inversionorder + numtiles
-            if verbose:
-                print("idx {} value {} tail {} #smaller {} sum: {}".format(
-                    idx, value, after, numtiles, inversionorder))
-
-        # Account for blank when there are an even number of rows
-        if self.get_rows() % 2 == 0:
-            if verbose:
-                print("Even # rows, adding for position of blank")
-            inversionorder = inversionorder + \
-                math.floor(tiles.index(None) / self.boardsize)+1
-
-        solvable = inversionorder % 2 == 0  # Solvable if even
-        return solvable
-                                
-    def __hash__(self):
-        "__hash__ - Hash the board state"
-        
-        # Convert state to a tuple and hash
-        return hash(self.state_tuple())
-    
-    def __eq__(self, other):
-        "__eq__ - Check if objects equal:  a == b"
-
-        # Are states identical?
-        return self.state_tuple() == other.state_tuple()
-
-        # Set pairs to be equal to another
-        # equal = True  # until we found out otherwise
-        # # pair up board items in tuples and compare them
-        # for (mystate, otherstate) in zip(self.state_tuple(), other.state_tuple()):
-        #     equal = mystate == otherstate
-        #     if not equal:
-        #         break
-        # return equal
-    
-    def state_tuple(self):
-        "state_tuple - Return board state as a single tuple"
-        
-        # Iterate over the items in each list, merging them
-        flattened = [item for sublist in self.board
-                            for item in sublist]
-        # convert to tuple (hashable) and return 
-        return(tuple(flattened))
-
-    def __hash__(self):
-        "hash( ) - Return hash of the TileBoard"
-        return hash(self.state_tuple())
-
-    def get_actions(self):
-        "Return row column offsets of where the empty tile can be moved"
-        
-        actions = []
-        # check row and column, no diagonal moves allowed
-        boarddims = [self.get_rows(), self.get_cols()]
-        # self.empty contains the location of the blank tile
-        # Determine whether or not offsets to this position
-        # will move it off the board.  Anything on the board
-        # is a legal move.
-        for dim in [0, 1]:  # rows, then columns
-            # Append offsets to the actions list, 
-            # e.g. move left --> (-1,0)
-            #      move down --> (0, 1)
-            # Note that when we append to the list of actions,
-            # we use list( ) to make a copy of the list, otherwise
-            # we just get a pointer to it and modification of offset
-            # will change copies in the list.
-            offset = [0, 0]
-            # add if we don't go off the top or left
-            if self.empty[dim] - 1 >= 0:
-                offset[dim] = -1
-                actions.append(list(offset))
-            # append if we don't go off the bottom or right
-            if self.empty[dim] + 1 < boarddims[dim]:
-                offset[dim] = 1
-                actions.append(list(offset))
-                
-        return actions
-            
-    def move(self, offset):
-        """move - Move the empty space by [delta_row, delta_col] and 
-        return new TileBoard
-        """
-        
-        # Current row and column of empty space
-        (r, c) = self.empty
-        
-        [delta_r, delta_c] = offset
-        
-        # validate
-        rprime = r + delta_r
-        cprime = c + delta_c
-        if rprime < 0 or cprime < 0 or \
-            rprime >= self.get_rows() or cprime >= self.get_cols():
-            raise ValueError("Illegal move (%d,%d) from (%d,%d)"%(
-                    delta_r, delta_c, r, c))
-
-        # Make a copy of the board so that mutating it does not 
-        # modify other copies of the board.  Not the most efficient
-        # way to do this, but it will get the job done.
-        newboard = copy.deepcopy(self)
-        # Slide a tile into the empty slot position
-        newboard.place(r, c, self.get(rprime, cprime))
-        # update empty position
-        newboard.place(rprime, cprime, None)
-        newboard.empty = (rprime, cprime)
-        
-        return newboard
-        
-    #def __repr__(self):
-    #    """Alternate board representation - as state tuple
-    #       Useful for verifying that solutions do not have duplicate
-    #       states in path."""
-    #    return str(self.state_tuple())
-    
-    def solved(self):
-        "solved - Is the puzzle solved?"
-
-        # Check if state is in goals
-        solved = self.state_tuple() in self.goals
-        return solved
\ No newline at end of file
+import random
+import math
+
+try:
+    import numpy  # only needed by TileBoard.solvable_batch
+except ImportError:
+    numpy = None
+
+from basicsearch_lib02.board import Board
+
+
+def inversion_parity(values):
+    """inversion_parity(values) - Parity (0 even, 1 odd) of the number of
+    inversions in a sequence holding each of 1..len(values) once.
+
+    The parity of a permutation is that of its length less its number of
+    cycles, so following each cycle once gives it in linear time without
+    counting the inversions themselves.
+    """
+    visited = [False] * len(values)
+    cycles = 0
+    for start in range(len(values)):
+        if not visited[start]:
+            cycles += 1
+            position = start
+            while not visited[position]:
+                visited[position] = True
+                position = values[position] - 1
+    return (len(values) - cycles) % 2
+
+
+def parity_class(tiles, boardsize):
+    """parity_class(tiles, boardsize) - Invariant (0 or 1) of a row-major
+    tile sequence under moves.  A board can only reach goals of its own
+    class:  the inversion parity of the tiles, plus the row of the blank
+    on boards of even width, where vertical moves flip the parity."""
+    value = inversion_parity([t for t in tiles if t is not None])
+    if boardsize % 2 == 0:
+        value += tiles.index(None) // boardsize
+    return value % 2
+
+
+class TileBoard(Board):
+    # Boards are immutable.  The grid is held as a single row-major tuple
+    # (None marks the blank) along with the index of the blank, so deriving
+    # a new board only needs to swap two entries.
+    __slots__ = ('tiles', 'blank', 'boardsize', 'goals', 'goalset',
+                 'verbose')
+
+    def __init__(self, n, multiple_solutions=False, force_state=None,
+                 verbose=False, rng=None):
+        """"TileBoard(n, multiple_solutions, force_state, verbose, rng)
+        Create a tile board for an n puzzle.
+        
+        If multipleSolutions is true, the solution need not
+        be in the bottom right.  This defaults to False but
+        is automatically set to True when there is no middle square 
+        
+        force_state can be used to initialize an n puzzle to a desired
+        configuration.  No error checking is done.  It is specified as
+        a list with n+1 elements in it, 1:n and None in the desired order.
+
+        Otherwise the board is drawn uniformly from the solvable boards
+        using rng (a random.Random), or the random module if rng is None.
+        """
+        
+        self.verbose = verbose
+        
+
+        self.boardsize = int(math.sqrt(n+1))  
+        if math.sqrt(n+1) != self.boardsize:
+            raise ValueError("Bad board size\n" +
+                "Must be one less than an odd perfect square 8, 24, ...")
+
+        # initialize parent, the grid itself is kept in self.tiles
+        super().__init__(self.boardsize, self.boardsize)
+        self.board = None
+
+
+        # Compute solution states
+        if multiple_solutions:
+            # Create list of goals [(None, 1, 2, 3, ..), (1, None, 2, 3, ...),
+            #                        (1, 2, None, 3, ...), ...]
+            self.goals = []
+            for hole_position in range(n+1):
+                solution = []
+                # Add numbers 1 to n, placing a None at current hole_position
+                for idx in range(n+1):
+                    if idx < hole_position:
+                        solution.append(idx+1)
+                    elif idx == hole_position:
+                        solution.append(None)
+                    else:
+                        solution.append(idx)
+                self.goals.append(tuple(solution))
+
+        else:
+            # Single goal, hole in last position [(1, 2, 3, ..., None)]
+            self.goals = [tuple([None if idx == n else idx+1
+                                     for idx in range(n+1)])]
+        # Goal tests are set lookups, there are n+1 goals with multiple
+        # solutions
+        self.goalset = frozenset(self.goals)
+
+        if force_state:
+            tiles = force_state
+            if not self.solvable(tiles):
+                raise ValueError("Puzzle is not solvable")
+        else:
+            tiles = self.random_tiles(random if rng is None else rng)
+
+        # populate the board with our tile order and
+        # keep track of the empty tile
+        self.tiles = tuple(tiles)
+        self.blank = self.tiles.index(None)
+
+    def random_tiles(self, rng):
+        """random_tiles(rng) - Uniformly random solvable tile list
+
+        The tiles are shuffled once.  If the result cannot be solved, the
+        first two tiles (skipping the blank) are swapped, which flips the
+        parity.  That swap pairs every unsolvable board with exactly one
+        solvable board, so no shuffles are wasted and every solvable
+        board is still equally likely.
+        """
+        tiles = list(range(1, self.boardsize * self.boardsize))
+        tiles.append(None)
+        rng.shuffle(tiles)  # mix up tiles
+        if not self.solvable(tiles):
+            (first, second) = [idx for idx in range(3) if tiles[idx]][:2]
+            tiles[first], tiles[second] = tiles[second], tiles[first]
+        return tiles
+
+    def _derive(self, tiles, blank):
+        """_derive(tiles, blank) - Return a board sharing this board's
+        size and goals with the given tile tuple and blank index.
+        No checking is done, callers must supply a legal configuration.
+        """
+        board = TileBoard.__new__(TileBoard)
+        board.rows = self.rows
+        board.cols = self.cols
+        board.displaycol = self.displaycol
+        board.empty_symbol = self.empty_symbol
+        board.board = None
+        board.boardsize = self.boardsize
+        board.goals = self.goals
+        board.goalset = self.goalset
+        board.verbose = self.verbose
+        board.tiles = tiles
+        board.blank = blank
+        return board
+
+    @property
+    def empty(self):
+        "empty - (row, column) of the blank tile"
+        return divmod(self.blank, self.boardsize)
+
+    def get(self, row, col):
+        "get an item"
+        return self.tiles[row * self.boardsize + col]
+
+    def place(self, row, col, item):
+        "place - not supported, TileBoards are immutable"
+        raise TypeError("TileBoard is immutable, use move() to derive boards")
+    
+    def solvable(self, tiles, verbose=False):
+        """solvable - Determines if a puzzle is solvable
+
+            Given a list of tiles, determine if the N-puzzle is solvable.
+            You do not need to know how to do this, but the calculation
+            is based on the inversion order.
+
+            for each number in the list of tiles,
+               How many following numbers are less than that one
+               e.g. [13, 10, 11, 6, 5, 7, 4, 8, 1, 12, 14, 9, 3, 15, 2, None]
+               Example:  Files following 9:  [3, 15, 2, None]
+               Two of these are smaller than 9, so the inversion order
+                   for 9 is 2
+
+            A puzzle's inversion order is the sum of the tile inversion
+            orders.  For puzzles with even numbers of rows and columns,
+            the row number on which the blank resides must be added.
+            Note that we need not worry about 1 as there are
+            no tiles smaller than one.
+
+            See Wolfram Mathworld for further explanation:
+                http://mathworld.wolfram.com/15Puzzle.html
+            and http://www.cut-the-knot.org/pythagoras/fifteen.shtml
+
+            This lets us know if a problem can be solved.  The inversion
+            order modulo 2 is invariant across moves.  This means that
+            when we make a legal move, the inversion order will always
+            be even or odd.  The solution state always has an even
+            inversion order, so any puzzle with an odd inversion
+            number cannot be solved.
+        """
+
+        if len(self.goals) > 1:
+            # Solvable if any of the goals can be reached
+            return parity_class(tiles, self.boardsize) in {
+                parity_class(goal, self.boardsize) for goal in self.goals}
+
+        # Make life easy, remove None.  Only the parity of the inversion
+        # order matters, which inversion_parity finds in linear time.
+        reduced = [t for t in tiles if t is not None]
+        inversionorder = inversion_parity(reduced)
+        if verbose:
+            print("tiles {} inversion order parity {}".format(
+                reduced, inversionorder))
+
+        # Account for blank when there are an even number of rows
+        if self.get_rows() % 2 == 0:
+            if verbose:
+                print("Even # rows, adding for position of blank")
+            inversionorder = inversionorder + \
+                math.floor(tiles.index(None) / self.boardsize)+1
+
+        solvable = inversionorder % 2 == 0  # Solvable if even
+        return solvable
+
+    @staticmethod
+    def solvable_batch(boards, chunk=1024):
+        """solvable_batch(boards, chunk) - Check many candidate boards at once
+
+        boards is a 2D array (or list of sequences), one row per board in
+        row-major order with 0 for the blank.  Returns a boolean array:
+        True for rows that are a permutation of 0..n and can reach the blank
+        last goal.
+
+        Each move swaps the blank with a neighbor, which flips the parity of
+        the permutation taking cells to the goal cells of their contents
+        and changes the blank's distance from the last cell by one.  A board
+        is solvable when those two parities agree.  The permutation parity
+        is found for all rows together by putting each value in place with
+        one vectorized swap per cell, processing chunk rows at a time.
+
+        Without NumPy, a list of bools is returned and boards are checked
+        one at a time with inversion_parity.
+        """
+        if numpy is None:
+            return [TileBoard._solvable_row(row) for row in boards]
+
+        boards = numpy.asarray(boards)
+        (count, cells) = boards.shape
+        boardsize = int(math.sqrt(cells))
+        if boardsize * boardsize != cells:
+            raise ValueError("Rows must hold a perfect square number of cells")
+        result = numpy.zeros(count, dtype=bool)
+        # Goal cell of each value, the blank (0) belongs in the last cell
+        goalcell = numpy.roll(numpy.arange(cells), 1)
+        for first in range(0, count, chunk):
+            rows = boards[first:first + chunk].astype(numpy.intp)
+            valid = (numpy.sort(rows, axis=1) == numpy.arange(cells)).all(axis=1)
+            rows[~valid] = numpy.arange(cells)
+            # Permutation cell -> goal cell of its tile, and its inverse,
+            # stored a cell per row so that each step reads whole rows
+            perm = goalcell[rows]
+            inverse = numpy.ascontiguousarray(numpy.argsort(perm, axis=1).T)
+            perm = numpy.ascontiguousarray(perm.T)
+            width = perm.shape[1]
+            offsets = numpy.arange(width)
+            parity = numpy.zeros(width, dtype=bool)
+            for cell in range(cells):
+                # swap whatever holds cell's value into cell
+                holder = inverse[cell].copy()
+                value = perm[cell].copy()
+                parity ^= holder != cell
+                perm.reshape(-1)[holder * width + offsets] = value
+                perm[cell] = cell
+                inverse.reshape(-1)[value * width + offsets] = holder
+                inverse[cell] = cell
+            blank = numpy.argmin(rows, axis=1)
+            distance = 2 * (boardsize - 1) - blank // boardsize - \
+                blank % boardsize
+            result[first:first + chunk] = valid & (parity == (distance % 2 == 1))
+        return result
+
+    @staticmethod
+    def _solvable_row(row):
+        "_solvable_row(row) - solvable_batch for a single row, without NumPy"
+        cells = len(row)
+        boardsize = int(math.sqrt(cells))
+        if boardsize * boardsize != cells or sorted(row) != list(range(cells)):
+            return False
+        tiles = [tile for tile in row if tile]
+        parity = inversion_parity(tiles)
+        if boardsize % 2 == 0:
+            parity += list(row).index(0) // boardsize + 1
+        return parity % 2 == 0
+                                
+    def __hash__(self):
+        "__hash__ - Hash the board state"
+        
+        # Convert state to a tuple and hash
+        return hash(self.state_tuple())
+    
+    def __eq__(self, other):
+        "__eq__ - Check if objects equal:  a == b"
+
+        # Are states identical?
+        return self.tiles == other.state_tuple()
+
+        # Set pairs to be equal to another
+        # equal = True  # until we found out otherwise
+        # # pair up board items in tuples and compare them
+        # for (mystate, otherstate) in zip(self.state_tuple(), other.state_tuple()):
+        #     equal = mystate == otherstate
+        #     if not equal:
+        #         break
+        # return equal
+    
+    def state_tuple(self):
+        "state_tuple - Return board state as a single tuple"
+        
+        # Already stored flattened and immutable
+        return self.tiles
+
+    def packed(self):
+        "packed - Return board state packed into an int (see pack)"
+        return pack(self.tiles, self.boardsize)
+
+    def get_actions(self):
+        "Return row column offsets of where the empty tile can be moved"
+        
+        actions = []
+        # check row and column, no diagonal moves allowed
+        boarddims = [self.get_rows(), self.get_cols()]
+        # self.empty contains the location of the blank tile
+        # Determine whether or not offsets to this position
+        # will move it off the board.  Anything on the board
+        # is a legal move.
+        for dim in [0, 1]:  # rows, then columns
+            # Append offsets to the actions list, 
+            # e.g. move left --> (-1,0)
+            #      move down --> (0, 1)
+            # Note that when we append to the list of actions,
+            # we use list( ) to make a copy of the list, otherwise
+            # we just get a pointer to it and modification of offset
+            # will change copies in the list.
+            offset = [0, 0]
+            # add if we don't go off the top or left
+            if self.empty[dim] - 1 >= 0:
+                offset[dim] = -1
+                actions.append(list(offset))
+            # append if we don't go off the bottom or right
+            if self.empty[dim] + 1 < boarddims[dim]:
+                offset[dim] = 1
+                actions.append(list(offset))
+                
+        return actions
+            
+    def move(self, offset):
+        """move - Move the empty space by [delta_row, delta_col] and 
+        return new TileBoard
+        """
+        
+        # Current row and column of empty space
+        (r, c) = self.empty
+        
+        [delta_r, delta_c] = offset
+        
+        # validate
+        rprime = r + delta_r
+        cprime = c + delta_c
+        if rprime < 0 or cprime < 0 or \
+            rprime >= self.get_rows() or cprime >= self.get_cols():
+            raise ValueError("Illegal move (%d,%d) from (%d,%d)"%(
+                    delta_r, delta_c, r, c))
+
+        # Slide a tile into the empty slot position and
+        # update empty position in a new tile tuple
+        target = rprime * self.boardsize + cprime
+        tiles = list(self.tiles)
+        tiles[self.blank] = tiles[target]
+        tiles[target] = None
+        
+        return self._derive(tuple(tiles), target)
+        
+    #def __repr__(self):
+    #    """Alternate board representation - as state tuple
+    #       Useful for verifying that solutions do not have duplicate
+    #       states in path."""
+    #    return str(self.state_tuple())
+    
+    def goal_boards(self):
+        "goal_boards - Return a TileBoard for each of the goal states"
+        return [self._derive(goal, goal.index(None)) for goal in self.goals]
+
+    def solved(self):
+        "solved - Is the puzzle solved?"
+
+        # Check if state is in goals
+        solved = self.tiles in self.goalset
+        return solved
+
+    def packed_goals(self):
+        "packed_goals - Return the goal states as a set of packed ints"
+        return frozenset(pack(goal, self.boardsize) for goal in self.goals)
+
+def tile_bits(boardsize):
+    "tile_bits(boardsize) - Number of bits pack() uses for each cell"
+    return (boardsize * boardsize - 1).bit_length()
+
+
+def pack(tiles, boardsize):
+    """pack(tiles, boardsize) - Pack a row-major tile sequence into an int
+    Cell i occupies bits [i*b, (i+1)*b) where b = tile_bits(boardsize) and
+    the blank is 0, so 3x3 and 4x4 boards fit in 64 bits."""
+    bits = tile_bits(boardsize)
+    packed = 0
+    for tile in reversed(tiles):
+        packed = (packed << bits) | (tile or 0)
+    return packed
+
+
+def unpack(packed, boardsize):
+    "unpack(packed, boardsize) - Tile tuple (None for blank) of a pack()"
+    bits = tile_bits(boardsize)
+    mask = (1 << bits) - 1
+    tiles = []
+    for _ in range(boardsize * boardsize):
+        tiles.append((packed & mask) or None)
+        packed >>= bits
+    return tuple(tiles)
+
+
+def random_boards(n, seed=None, multiple_solutions=False, packed=False):
+    """random_boards(n, seed, multiple_solutions, packed)
+    Generate an endless stream of uniformly random solvable n puzzle
+    boards from a random.Random(seed), so a seed always gives the same
+    stream.  Yields TileBoards, or their pack() ints if packed is True.
+    """
+    rng = random.Random(seed)
+    # Goal board, boards in the stream share its size and goals
+    template = TileBoard(n, multiple_solutions,
+                         force_state=list(range(1, n + 1)) + [None])
+    while True:
+        tiles = template.random_tiles(rng)
+        if packed:
+            yield pack(tiles, template.boardsize)
+        else:
+            yield template._derive(tuple(tiles), tiles.index(None))
+
+
+class MutableTileBoard(object):
+    """Mutable working copy of a TileBoard for in-place searches.
+
+    Tiles are kept in a list and make()/unmake() slide a tile into the
+    blank and back without allocating a new board.  Like TileBoard it
+    exposes tiles, blank, boardsize and goals, so heuristics can evaluate it.
+    """
+    __slots__ = ('tiles', 'blank', 'boardsize', 'goals', 'template')
+
+    def __init__(self, board):
+        "MutableTileBoard(board) - working copy of a TileBoard"
+        self.tiles = list(board.tiles)
+        self.blank = board.blank
+        self.boardsize = board.boardsize
+        self.goals = board.goals
+        self.template = board  # supplies goals and builds TileBoards
+
+    def make(self, offset):
+        "make(offset) - Move the empty space by [delta_row, delta_col]"
+        [delta_r, delta_c] = offset
+        target = self.blank + delta_r * self.boardsize + delta_c
+        self.tiles[self.blank] = self.tiles[target]
+        self.tiles[target] = None
+        self.blank = target
+
+    def unmake(self, offset):
+        "unmake(offset) - Undo make(offset)"
+        [delta_r, delta_c] = offset
+        self.make([-delta_r, -delta_c])
+
+    def get_actions(self):
+        "Return row column offsets of where the empty tile can be moved"
+        return self.freeze().get_actions()
+
+    def state_tuple(self):
+        "state_tuple - Return board state as a single tuple"
+        return tuple(self.tiles)
+
+    def solved(self):
+        "solved - Is the puzzle solved?"
+        return tuple(self.tiles) in self.template.goalset
+
+    def freeze(self):
+        "freeze - Return an immutable TileBoard with the current tiles"
+        return self.template._derive(tuple(self.tiles), self.blank)
+
+    def __repr__(self):
+        return repr(self.freeze())
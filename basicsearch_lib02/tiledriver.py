@@ -1,21 +1,21 @@
-'''
-driver for graph search problem
-
-'''
-
-from statistics import (mean, stdev)  # Only available in Python 3.4 and newer
-
-from npuzzle import NPuzzle
-from tileboard import TileBoard
-from basicsearch_lib02.timer import Timer
-from searchstrategies import (BreadthFirst, DepthFirst, Manhattan)
-from problemsearch import graph_search
-import collections
-
-
-
-def driver() :
-    raise NotImplemented
-
-
-# To do:  Run driver() if this is the entry module
+'''
+driver for graph search problem
+
+'''
+
+from statistics import (mean, stdev)  # Only available in Python 3.4 and newer
+
+from npuzzle import NPuzzle
+from tileboard import TileBoard
+from basicsearch_lib02.timer import Timer
+from searchstrategies import (BreadthFirst, DepthFirst, Manhattan)
+from problemsearch import graph_search
+import collections
+
+
+
+def driver() :
+    raise NotImplemented
+
+
+# To do:  Run driver() if this is the entry module
@@ -0,0 +1,292 @@
+'''
+benchmark - Reproducible performance measurements for the search engines
+
+Runs each search engine with each heuristic over a fixed corpus of
+instances per board size and records, per combination:
+    instances, failures (instances without a plan, beam search only),
+    plan_length (total moves), expanded (nodes explored as reported by
+    the engine), generated and peak_frontier (as counted by the engine's
+    SearchStats, null for engines that do not take one),
+    peak_memory_kb (tracemalloc peak, only with --memory as it slows the
+    search down), wall_s, cpu_s, expanded_per_s
+Metrics other than failures cover the instances that were solved.
+
+The 5x5 WalkingDistance table takes gigabytes to build, so that
+heuristic only runs on 5x5 boards when asked for with --heuristics.
+
+Results are written to a JSON file.  A stored result file can serve as
+a baseline for a later run; compare flags every metric that got worse
+by more than a tolerance.
+
+    python benchmark.py run --output results.json
+    python benchmark.py compare baseline.json results.json --tolerance 0.1
+'''
+
+import argparse
+import functools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from npuzzle import NPuzzle
+from searchstrategies import (Manhattan, LinearConflict, WalkingDistance)
+from problemsearch import (graph_search, ida_search, bidirectional_search,
+                           beam_search, _Probe)
+from searchstats import SearchStats
+
+FORMAT_VERSION = 1
+
+# Corpus definition per board size:  (seed, number of instances, scramble)
+# 3x3 instances are uniformly random boards.  Larger boards are random
+# walks of the given length away from the goal, so that every engine
+# finishes in reasonable time.
+CORPORA = {
+    3: (3, 20, None),
+    4: (4, 10, 40),
+    5: (5, 5, 30),
+}
+
+ENGINES = {
+    'astar': graph_search,
+    'packed': functools.partial(graph_search, packed=True),
+    'ida': ida_search,
+    'bidirectional': bidirectional_search,
+    # Not optimal, its plan_length is tracked along with its speed
+    'beam': functools.partial(beam_search, width=100),
+}
+
+# Engines that accept stats=SearchStats(...).  They count without timing
+# phases, which keeps the overhead small.
+OBSERVED = {'astar', 'packed', 'beam', 'bidirectional'}
+
+HEURISTICS = {
+    'manhattan': Manhattan,
+    'linearconflict': LinearConflict,
+    'walkingdistance': WalkingDistance,
+}
+
+# Heuristics left out by default for a board size
+SKIPPED = {5: {'walkingdistance'}}
+
+# Metrics compared against a baseline and whether larger values are better
+METRICS = {
+    'failures': False,
+    'plan_length': False,
+    'expanded': False,
+    'generated': False,
+    'peak_frontier': False,
+    'peak_memory_kb': False,
+    'wall_s': False,
+    'cpu_s': False,
+    'expanded_per_s': True,
+}
+
+
+def corpus(boardsize, count=None):
+    """corpus(boardsize, count) - The fixed instances for a board size as a
+    list of tile tuples.  count may select a prefix of the corpus."""
+    (seed, size, scramble) = CORPORA[boardsize]
+    if count is not None:
+        size = min(size, count)
+    rng = random.Random(seed)
+    n = boardsize * boardsize - 1
+    goal = NPuzzle(n, force_state=list(range(1, n + 1)) + [None]).initial
+    instances = []
+    for _ in range(size):
+        if scramble is None:
+            tiles = goal.random_tiles(rng)
+        else:
+            # random walk that never immediately undoes a move
+            board = goal
+            previous = None
+            for _ in range(scramble):
+                actions = [a for a in board.get_actions()
+                           if previous is None or
+                           a != [-previous[0], -previous[1]]]
+                previous = rng.choice(actions)
+                board = board.move(previous)
+            tiles = board.state_tuple()
+        instances.append(tuple(tiles))
+    return instances
+
+
+def run_case(boardsize, engine, heuristic, instances, memory=False):
+    """run_case(boardsize, engine, heuristic, instances, memory) - Solve
+    every instance with one engine and heuristic and return the metrics"""
+    search = ENGINES[engine]
+    strategy = HEURISTICS[heuristic]
+    n = boardsize * boardsize - 1
+    observed = engine in OBSERVED
+    totals = {'failures': 0, 'plan_length': 0, 'expanded': 0,
+              'generated': 0 if observed else None,
+              'peak_frontier': 0 if observed else None,
+              'peak_memory_kb': None, 'wall_s': 0.0, 'cpu_s': 0.0}
+    # Build lazily created tables outside the timed region
+    problem = NPuzzle(n, force_state=list(instances[0]))
+    strategy.h(_Probe(problem.initial))
+
+    for tiles in instances:
+        problem = NPuzzle(n, force_state=list(tiles))
+        problem.g = strategy.g
+        problem.h = strategy.h
+
+        if memory:
+            tracemalloc.start()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if observed:
+            stats = SearchStats(timing=False)
+            result = search(problem, stats=stats)
+        else:
+            result = search(problem)
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+            totals['peak_memory_kb'] = max(totals['peak_memory_kb'] or 0, peak)
+
+        if result is None:
+            # Beam search can prune every way to the goal
+            totals['failures'] += 1
+            continue
+        (path, expanded, _) = result
+        totals['plan_length'] += len(path) - 1
+        totals['expanded'] += expanded
+        if observed:
+            totals['generated'] += stats.generations
+            totals['peak_frontier'] = max(totals['peak_frontier'],
+                                          stats.peak_frontier)
+        totals['wall_s'] += wall
+        totals['cpu_s'] += cpu
+
+    totals['expanded_per_s'] = totals['expanded'] / totals['wall_s'] \
+        if totals['wall_s'] > 0 else 0.0
+    totals.update({'size': boardsize, 'engine': engine,
+                   'heuristic': heuristic, 'instances': len(instances)})
+    return totals
+
+
+def run(sizes=(3, 4), engines=None, heuristics=None, count=None,
+        memory=False, verbose=True):
+    """run(sizes, engines, heuristics, count, memory, verbose) - Benchmark
+    every engine and heuristic on each board size and return the results
+    as a JSON-ready dictionary.  If engines or heuristics is None, all of
+    them are run, except the heuristics in SKIPPED for a board size."""
+    engines = list(ENGINES) if engines is None else engines
+    results = []
+    for boardsize in sizes:
+        instances = corpus(boardsize, count)
+        chosen = heuristics
+        if chosen is None:
+            chosen = [heuristic for heuristic in HEURISTICS
+                      if heuristic not in SKIPPED.get(boardsize, ())]
+        for engine in engines:
+            for heuristic in chosen:
+                result = run_case(boardsize, engine, heuristic, instances,
+                                  memory)
+                results.append(result)
+                if verbose:
+                    print('{}x{} {:<13} {:<15} expanded {:>9} '
+                          'wall {:8.3f}s  {:>10.0f} nodes/s'.format(
+                              boardsize, boardsize, engine, heuristic,
+                              result['expanded'], result['wall_s'],
+                              result['expanded_per_s']))
+    return {
+        'version': FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpora': {str(size): [list(tiles) for tiles in corpus(size, count)]
+                    for size in sizes},
+        'results': results,
+    }
+
+
+def compare(baseline, current, tolerance=0.1):
+    """compare(baseline, current, tolerance) - Regressions of current
+    against baseline, two run() dictionaries.  Returns a list of messages,
+    one per metric that is worse by more than tolerance (a fraction) for a
+    combination present in both.  Combinations measured on different
+    corpora are reported rather than compared."""
+    regressions = []
+    key = lambda r: (r['size'], r['engine'], r['heuristic'])
+    before = {key(r): r for r in baseline['results']}
+    for result in current['results']:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        name = '{}x{} {} {}'.format(result['size'], result['size'],
+                                    result['engine'], result['heuristic'])
+        size = str(result['size'])
+        if baseline['corpora'].get(size) != current['corpora'].get(size):
+            regressions.append('{}: corpus differs from baseline'.format(name))
+            continue
+        for metric, larger_is_better in METRICS.items():
+            (was, now) = (old.get(metric), result.get(metric))
+            if was is None or now is None:
+                continue
+            if larger_is_better:
+                worse = now < was * (1 - tolerance)
+            else:
+                worse = now > was * (1 + tolerance)
+            if worse:
+                regressions.append('{}: {} {} -> {}'.format(
+                    name, metric, was, now))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Search engine benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    runner = commands.add_parser('run', help='run the benchmarks')
+    runner.add_argument('--output', default='benchmark.json',
+                        help='result file (default benchmark.json)')
+    runner.add_argument('--sizes', type=int, nargs='+', default=[3, 4],
+                        choices=sorted(CORPORA))
+    runner.add_argument('--engines', nargs='+', choices=sorted(ENGINES))
+    runner.add_argument('--heuristics', nargs='+', choices=sorted(HEURISTICS))
+    runner.add_argument('--count', type=int,
+                        help='use only the first COUNT instances of a corpus')
+    runner.add_argument('--memory', action='store_true',
+                        help='record peak memory (slower)')
+    runner.add_argument('--baseline',
+                        help='compare against this result file when done')
+    runner.add_argument('--tolerance', type=float, default=0.1)
+
+    comparer = commands.add_parser('compare',
+                                   help='compare two result files')
+    comparer.add_argument('baseline')
+    comparer.add_argument('current')
+    comparer.add_argument('--tolerance', type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        current = run(args.sizes, args.engines, args.heuristics, args.count,
+                      args.memory)
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=1)
+        if args.baseline is None:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    regressions = compare(baseline, current, args.tolerance)
+    for message in regressions:
+        print('REGRESSION', message)
+    if not regressions:
+        print('No regressions beyond {:.0%}'.format(args.tolerance))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+distancetable - Exact solution lengths for every 8 puzzle state
+
+The 8 puzzle has only 181,440 states reachable from the (blank last)
+goal.  One backward breadth-first search from the goal finds the
+distance of each of them, which is stored as one byte per state indexed
+by ranking.rank_tiles.  With the table, an optimal plan is found by
+repeatedly moving to a neighbor one step closer to the goal, without
+any search.
+
+Build the table file once:
+    python distancetable.py eightpuzzle.dist
+
+The distance files of externalbfs (depth plus one after a header) can
+be loaded too.
+"""
+
+import mmap
+import sys
+
+import externalbfs
+import ranking
+from basicsearch_lib02.timer import Timer
+from problemsearch import solution_path
+
+BOARDSIZE = 3
+UNREACHED = 255  # distance byte of states not yet reached
+
+
+def build(filename=None, verbose=False):
+    """build(filename, verbose) - Distances of all 8 puzzle states
+    Returns a bytearray indexed by rank, written to filename if given."""
+    cells = BOARDSIZE * BOARDSIZE
+    neighbors = [
+        [p for p in (pos - BOARDSIZE, pos + BOARDSIZE) if 0 <= p < cells] +
+        [p for p in (pos - 1, pos + 1) if p // BOARDSIZE == pos // BOARDSIZE]
+        for pos in range(cells)]
+
+    distances = bytearray([UNREACHED]) * ranking.state_count(BOARDSIZE)
+    goal = tuple(list(range(1, cells)) + [None])
+    distances[ranking.rank_tiles(goal)] = 0
+    layer = [goal]
+    depth = 0
+    while layer:
+        depth += 1
+        following = []
+        for tiles in layer:
+            blank = tiles.index(None)
+            for neighbor in neighbors[blank]:
+                child = list(tiles)
+                child[blank] = child[neighbor]
+                child[neighbor] = None
+                rank = ranking.rank_tiles(child)
+                if distances[rank] == UNREACHED:
+                    distances[rank] = depth
+                    following.append(tuple(child))
+        if verbose and following:
+            print("depth {}: {} states".format(depth, len(following)))
+        layer = following
+
+    if filename is not None:
+        with open(filename, "wb") as f:
+            f.write(distances)
+    return distances
+
+
+class DistanceTable(object):
+    """
+    Exact distance to the goal of every 8 puzzle state, indexed by rank.
+    """
+
+    def __init__(self, distances):
+        "DistanceTable(distances) - wrap a bytes-like table from build()"
+        if len(distances) != ranking.state_count(BOARDSIZE):
+            raise ValueError("Distance table has %d entries, expected %d" % (
+                len(distances), ranking.state_count(BOARDSIZE)))
+        self.distances = distances
+
+    @classmethod
+    def load(cls, filename):
+        """load(filename) - Memory map a table file written by build(), or
+        read a full 8 puzzle distance file of externalbfs"""
+        with open(filename, "rb") as f:
+            # The mapping stays valid after the file is closed
+            distances = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if distances[:len(externalbfs.MAGIC)] == externalbfs.MAGIC:
+            if externalbfs.read_header(distances) != BOARDSIZE:
+                raise ValueError("%s is not an 8 puzzle table" % filename)
+            table = externalbfs.depth_table(distances)
+            distances.close()
+            if UNREACHED in table:
+                raise ValueError("%s is from a partial search" % filename)
+            return cls(table)
+        return cls(distances)
+
+    def distance(self, board):
+        "distance(board) - Number of moves in an optimal plan for board"
+        return self.distances[ranking.rank(board)]
+
+    def solve(self, board):
+        """solve(board) - Optimal list of actions from board to the goal,
+        always stepping to a neighbor that is one move closer"""
+        if board.boardsize != BOARDSIZE or len(board.goals) != 1 or \
+                board.goals[0][-1] is not None:
+            raise ValueError("Only 8 puzzles with the blank last goal")
+        actions = []
+        remaining = self.distance(board)
+        while remaining > 0:
+            for action in board.get_actions():
+                child = board.move(action)
+                if self.distance(child) == remaining - 1:
+                    break
+            else:
+                raise ValueError("Distance table is inconsistent")
+            actions.append(action)
+            board = child
+            remaining -= 1
+        return actions
+
+
+def table_search(problem, table, verbose=False):
+    """table_search(problem, table, verbose) - Solve an 8 puzzle problem
+    with a DistanceTable.  Returns the same (path, nodes_explored,
+    elapsed_s) tuple as graph_search, where nodes_explored is the number
+    of moves, each of which looks at the neighbors of one state."""
+    timer = Timer()
+    actions = table.solve(problem.initial)
+    return (solution_path(problem, actions, verbose), len(actions),
+            timer.elapsed_s())
+
+
+if __name__ == "__main__":
+    # python distancetable.py filename
+    if len(sys.argv) != 2:
+        print("usage: python distancetable.py filename")
+        sys.exit(1)
+    build(sys.argv[1], verbose=True)
@@ -1,44 +1,148 @@
-"""
-Class for maintaining explored sets
-"""
-
-class Explored(object):
-    """
-    Maintain an explored set.  Assumes that states are hashable
-    (e.g. state is represented by a tuple)
-    """
-
-    def __init__(self):
-        "__init__() - Create an empty explored set"
-        
-        self.hash_map = dict()
-
-
-    def exists(self, state):
-        """
-        exists(state) - Has this state already been explored?
-
-        :param state:  Hashable problem state
-        :return: True if already seen, False otherwise
-        """
-
-        #We will try to check if it exists in the hash_map variable. If it exists, return True, and if not, return False.
-        try:
-            return state in self.hash_map[hash(state)]
-        except KeyError:
-            return False
-
-
-
-    def add(self, state):
-        """
-        add(state) - Add a given state to the explored set
-
-        :param state:  A problem state that is hashable, e.g. a tuple
-        :return: None
-        """
-
-        #If the current check isn't already in the hash_map variable, it will add it into the hash_map variable.
-        if hash(state) not in self.hash_map.keys():
-            self.hash_map[hash(state)] = set()
-        self.hash_map[hash(state)].add(state)
+"""
+Classes for maintaining explored sets
+
+Explored - any hashable states
+BitmapExplored - N-puzzle state tuples, one bit per reachable state
+IntSetExplored - N-puzzle state tuples, a set of state ranks
+compact_explored(boardsize) - whichever of the last two fits
+"""
+
+import ranking
+
+class Explored(object):
+    """
+    Maintain an explored set.  Assumes that states are hashable
+    (e.g. state is represented by a tuple)
+    """
+
+    def __init__(self):
+        "__init__() - Create an empty explored set"
+        
+        self.hash_map = dict()
+        self.count = 0  # number of states added
+
+
+    def exists(self, state):
+        """
+        exists(state) - Has this state already been explored?
+
+        :param state:  Hashable problem state
+        :return: True if already seen, False otherwise
+        """
+
+        #We will try to check if it exists in the hash_map variable. If it exists, return True, and if not, return False.
+        try:
+            return state in self.hash_map[hash(state)]
+        except KeyError:
+            return False
+
+
+
+    def add(self, state):
+        """
+        add(state) - Add a given state to the explored set
+
+        :param state:  A problem state that is hashable, e.g. a tuple
+        :return: None
+        """
+
+        #If the current check isn't already in the hash_map variable, it will add it into the hash_map variable.
+        key = hash(state)
+        if key not in self.hash_map:
+            self.hash_map[key] = set()
+        if state not in self.hash_map[key]:
+            self.hash_map[key].add(state)
+            self.count += 1
+
+    def __len__(self):
+        "len() - Number of states in the explored set"
+        return self.count
+
+
+class BitmapExplored(object):
+    """
+    Explored set of N-puzzle states (state tuples) held as a bit array
+    indexed by ranking.rank_tiles, one bit per state reachable from the
+    goal.  The 8 puzzle needs 181,440 bits (about 23 KB).
+    """
+
+    def __init__(self, boardsize):
+        "__init__(boardsize) - Create an empty explored set"
+        self.bits = bytearray((ranking.state_count(boardsize) + 7) // 8)
+        self.count = 0
+
+    def exists(self, state):
+        """
+        exists(state) - Has this state already been explored?
+
+        :param state:  N-puzzle state tuple
+        :return: True if already seen, False otherwise
+        """
+        rank = ranking.rank_tiles(state)
+        return bool(self.bits[rank >> 3] & (1 << (rank & 7)))
+
+    def add(self, state):
+        """
+        add(state) - Add a given state to the explored set
+
+        :param state:  N-puzzle state tuple
+        :return: None
+        """
+        rank = ranking.rank_tiles(state)
+        mask = 1 << (rank & 7)
+        if not self.bits[rank >> 3] & mask:
+            self.bits[rank >> 3] |= mask
+            self.count += 1
+
+    def __len__(self):
+        "len() - Number of states in the explored set"
+        return self.count
+
+
+class IntSetExplored(object):
+    """
+    Explored set of N-puzzle states (state tuples) stored as a set of
+    their ranks, for boards whose state space is too big for a bitmap.
+    An integer takes far less room than a tuple of tiles.
+    """
+
+    def __init__(self):
+        "__init__() - Create an empty explored set"
+        self.ranks = set()
+
+    def exists(self, state):
+        """
+        exists(state) - Has this state already been explored?
+
+        :param state:  N-puzzle state tuple
+        :return: True if already seen, False otherwise
+        """
+        return ranking.rank_tiles(state) in self.ranks
+
+    def add(self, state):
+        """
+        add(state) - Add a given state to the explored set
+
+        :param state:  N-puzzle state tuple
+        :return: None
+        """
+        self.ranks.add(ranking.rank_tiles(state))
+
+    def __len__(self):
+        "len() - Number of states in the explored set"
+        return len(self.ranks)
+
+
+def compact_explored(boardsize, max_bitmap_bytes=1 << 26):
+    """compact_explored(boardsize, max_bitmap_bytes) - An empty
+    BitmapExplored if its bit array needs no more than max_bitmap_bytes
+    (64 MB by default), otherwise an empty IntSetExplored.
+
+    Both hold ranks (see ranking), which only tell apart the boards
+    reachable from the blank last goal.  On even board sizes, a board
+    with several goals (see TileBoard.goalset) can be in the other half
+    of the tile orders; ranking such a board raises ValueError instead of
+    mistaking it for an explored one."""
+    if (ranking.state_count(boardsize) + 7) // 8 <= max_bitmap_bytes:
+        return BitmapExplored(boardsize)
+    return IntSetExplored()
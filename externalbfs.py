@@ -0,0 +1,344 @@
+"""
+externalbfs - Disk based breadth-first search over N-puzzle states
+
+Breadth-first search from one or more boards that keeps its layers on
+disk instead of in an explored set, so the number of states it can
+enumerate is limited by disk space rather than memory.
+
+Each layer is a file of packed states (tileboard.pack) in ascending
+order, one fixed width big-endian record per state.  The successors of
+a layer are collected in a buffer of at most buffer_states states, which
+is sorted and written out as a run file whenever it fills up.  The runs
+are then merged, at most fan_in at a time, and a successor is kept only
+if it is new:  not a repeat within the merge and not in the current or
+the previous layer.  Moves are reversible, so those two layers are the
+only places a successor can have been seen before (delayed duplicate
+detection).  Only sorted streams are read, through a bounded number of
+open files, so memory is bounded by the buffer and the fan-in.
+
+Optionally the depth of every state is also written to a distance file:
+a header (MAGIC, VERSION and the board size) followed by one byte per
+state indexed by ranking.rank_tiles, holding the depth plus one, with 0
+for states not reached (see depth_of).  The file has (N+1)!/2 bytes
+after the header, but only the bytes of reached states are written, so
+on file systems with sparse files a partial search of a larger puzzle
+only takes disk space for the states it reached.
+
+This is not the layout of the distancetable files (.dist), which have
+no header and hold the plain depth with 255 for unreached states.
+distancetable.DistanceTable.load reads both; depth_table converts.
+
+    python externalbfs.py 3 workdir --distances eightpuzzle.bfs
+"""
+
+import argparse
+import heapq
+import os
+import struct
+
+import ranking
+from basicsearch_lib02.tileboard import (TileBoard, pack, unpack, tile_bits)
+
+UNREACHED = 0  # distance byte of states not reached, others hold depth + 1
+READ_SIZE = 1 << 16  # bytes read from a layer or run file at a time
+FAN_IN = 16  # most run files merged at once
+MAGIC = b"NBFS"
+VERSION = 1
+HEADER = struct.Struct("<4sBBxx")  # magic, version, boardsize
+
+
+def record_width(boardsize):
+    "record_width(boardsize) - Bytes used to store one packed state"
+    return (boardsize * boardsize * tile_bits(boardsize) + 7) // 8
+
+
+def read_states(filename, width):
+    "read_states(filename, width) - Packed states in a layer or run file"
+    with open(filename, "rb") as f:
+        while True:
+            block = f.read(READ_SIZE - READ_SIZE % width)
+            if not block:
+                return
+            for start in range(0, len(block), width):
+                yield int.from_bytes(block[start:start + width], "big")
+
+
+def write_states(filename, states, width):
+    """write_states(filename, states, width) - Write packed states, which
+    must be in ascending order, and return how many were written"""
+    count = 0
+    buffer = bytearray()
+    with open(filename, "wb") as f:
+        for state in states:
+            buffer += state.to_bytes(width, "big")
+            count += 1
+            if len(buffer) >= READ_SIZE:
+                f.write(buffer)
+                buffer.clear()
+        f.write(buffer)
+    return count
+
+
+def _unique(states):
+    "_unique(states) - Ascending states without repeats"
+    previous = None
+    for state in states:
+        if state != previous:
+            yield state
+            previous = state
+
+
+def read_header(distances):
+    """read_header(distances) - Board size of the bytes of a distance file,
+    ValueError if they are not one"""
+    if len(distances) < HEADER.size:
+        raise ValueError("Not an external BFS distance file")
+    (magic, version, boardsize) = HEADER.unpack_from(distances)
+    if magic != MAGIC:
+        raise ValueError("Not an external BFS distance file")
+    if version != VERSION:
+        raise ValueError("Unsupported distance file version %d" % version)
+    if len(distances) != HEADER.size + ranking.state_count(boardsize):
+        raise ValueError("Distance file has the wrong size")
+    return boardsize
+
+
+def depth_of(distances, tiles):
+    """depth_of(distances, tiles) - Depth of a board (tile sequence) in the
+    bytes of a distance file, e.g. read or memory mapped, None if the
+    search did not reach it"""
+    value = distances[HEADER.size + ranking.rank_tiles(tiles)]
+    return None if value == UNREACHED else value - 1
+
+
+def depth_table(distances):
+    """depth_table(distances) - The bytes of a distance file as a bytes
+    table of plain depths, 255 for unreached states, the layout of
+    distancetable"""
+    read_header(distances)
+    # 0 (unreached) becomes 255, depth + 1 becomes depth
+    return bytes(distances[HEADER.size:]).translate(
+        bytes([255]) + bytes(range(255)))
+
+
+def _new_states(candidates, *layers):
+    """_new_states(candidates, *layers) - The candidates, an ascending
+    stream, that are not in any of the ascending streams of layers"""
+    heads = []
+    for layer in layers:
+        iterator = iter(layer)
+        heads.append([next(iterator, None), iterator])
+    for state in candidates:
+        seen = False
+        for head in heads:
+            while head[0] is not None and head[0] < state:
+                head[0] = next(head[1], None)
+            if head[0] == state:
+                seen = True
+        if not seen:
+            yield state
+
+
+class ExternalBFS(object):
+    """
+    Disk based breadth first search over packed N-puzzle states.
+    """
+
+    def __init__(self, boardsize, workdir, buffer_states=1 << 20,
+                 fan_in=FAN_IN):
+        """ExternalBFS(boardsize, workdir, buffer_states, fan_in)
+        boardsize - number of rows (and columns)
+        workdir - directory for layer and run files, created if needed
+        buffer_states - most successors held in memory before a sorted
+            run is written to disk
+        fan_in - most run files open at once while merging
+        """
+        if buffer_states < 1:
+            raise ValueError("buffer_states must be positive")
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.boardsize = boardsize
+        self.workdir = workdir
+        self.buffer_states = buffer_states
+        self.fan_in = fan_in
+        self.width = record_width(boardsize)
+        self.bits = tile_bits(boardsize)
+        cells = boardsize * boardsize
+        # Cells the blank can move to from each cell
+        self.neighbors = [
+            [p for p in (pos - boardsize, pos + boardsize) if 0 <= p < cells] +
+            [p for p in (pos - 1, pos + 1) if p // boardsize == pos // boardsize]
+            for pos in range(cells)]
+        os.makedirs(workdir, exist_ok=True)
+
+    def layer_file(self, depth):
+        "layer_file(depth) - Name of the file holding the states at depth"
+        return os.path.join(self.workdir, "layer-%d.bin" % depth)
+
+    def successors(self, state):
+        "successors(state) - Packed states one move away from a packed state"
+        bits = self.bits
+        mask = (1 << bits) - 1
+        blank = 0
+        while (state >> blank * bits) & mask:
+            blank += 1
+        result = []
+        for target in self.neighbors[blank]:
+            # The tile at target slides into the blank
+            tile = (state >> target * bits) & mask
+            result.append(state + (tile << blank * bits) -
+                          (tile << target * bits))
+        return result
+
+    def _runs(self, depth):
+        """_runs(depth) - Write the successors of layer depth to sorted run
+        files of at most buffer_states states, returning their names"""
+        runs = []
+        buffer = []
+
+        def flush():
+            name = os.path.join(self.workdir,
+                                "run-%d-%d.bin" % (depth + 1, len(runs)))
+            buffer.sort()
+            write_states(name, _unique(buffer), self.width)
+            runs.append(name)
+            buffer.clear()
+
+        for state in read_states(self.layer_file(depth), self.width):
+            buffer.extend(self.successors(state))
+            if len(buffer) >= self.buffer_states:
+                flush()
+        if buffer:
+            flush()
+        return runs
+
+    def _merge(self, runs, depth):
+        """_merge(runs, depth) - Merge run files in passes of at most fan_in
+        runs until at most fan_in are left, returning their names"""
+        merges = 0
+        while len(runs) > self.fan_in:
+            merged = []
+            for start in range(0, len(runs), self.fan_in):
+                group = runs[start:start + self.fan_in]
+                if len(group) == 1:
+                    merged.extend(group)
+                    continue
+                name = os.path.join(self.workdir,
+                                    "merge-%d-%d.bin" % (depth + 1, merges))
+                merges += 1
+                write_states(name, _unique(heapq.merge(
+                    *[read_states(run, self.width) for run in group])),
+                    self.width)
+                for run in group:
+                    os.remove(run)
+                merged.append(name)
+            runs = merged
+        return runs
+
+    def run(self, starts, distance_file=None, max_depth=None, keep=False,
+            verbose=False):
+        """run(starts, distance_file, max_depth, keep, verbose) - Search
+        breadth first from the boards in starts (TileBoards or tile
+        sequences) until no new states are found or max_depth is reached.
+        Returns a list with the number of states at each depth.
+
+        distance_file - name of a rank indexed distance file to write
+        keep - keep every layer file, otherwise only the last one remains
+        """
+        width = self.width
+        initial = sorted({pack(getattr(start, "tiles", start), self.boardsize)
+                          for start in starts})
+        counts = [write_states(self.layer_file(0), initial, width)]
+        distances = None
+        if distance_file is not None:
+            distances = self._open_distances(distance_file)
+            self._record(distances, self.layer_file(0), 0)
+        if verbose:
+            print("depth 0: {} states".format(counts[0]))
+
+        depth = 0
+        try:
+            while counts[depth] and (max_depth is None or depth < max_depth):
+                runs = self._merge(self._runs(depth), depth)
+                candidates = _unique(heapq.merge(
+                    *[read_states(run, width) for run in runs]))
+                layers = [read_states(self.layer_file(depth), width)]
+                if depth > 0:
+                    layers.append(read_states(self.layer_file(depth - 1),
+                                              width))
+                count = write_states(self.layer_file(depth + 1),
+                                     _new_states(candidates, *layers), width)
+                for run in runs:
+                    os.remove(run)
+                if not keep and depth > 0:
+                    os.remove(self.layer_file(depth - 1))
+                depth += 1
+                counts.append(count)
+                if distances is not None:
+                    self._record(distances, self.layer_file(depth), depth)
+                if verbose:
+                    print("depth {}: {} states".format(depth, count))
+        finally:
+            if distances is not None:
+                distances.close()
+        if not counts[-1]:
+            # The search ran out of states, the last layer is empty
+            counts.pop()
+            os.remove(self.layer_file(len(counts)))
+        elif not keep and depth > 0:
+            # max_depth stopped the search, the layer before the last is
+            # no longer needed either
+            os.remove(self.layer_file(depth - 1))
+        return counts
+
+    def _open_distances(self, filename):
+        """_open_distances(filename) - Distance file with every state
+        unreached.  Only the header is written and the file is extended
+        without writing, so the unreached regions stay holes where the
+        file system supports them."""
+        f = open(filename, "w+b")
+        f.write(HEADER.pack(MAGIC, VERSION, self.boardsize))
+        f.truncate(HEADER.size + ranking.state_count(self.boardsize))
+        return f
+
+    def _record(self, distances, layer, depth):
+        "_record(distances, layer, depth) - Store depth for states of a layer"
+        if depth + 1 > 255:
+            raise ValueError("Distances do not fit in a byte")
+        value = bytes([depth + 1])
+        for state in read_states(layer, self.width):
+            distances.seek(HEADER.size +
+                           ranking.rank_tiles(unpack(state, self.boardsize)))
+            distances.write(value)
+
+
+def external_bfs(start, workdir, buffer_states=1 << 20, distance_file=None,
+                 max_depth=None, verbose=False, fan_in=FAN_IN):
+    """external_bfs(start, workdir, buffer_states, distance_file, max_depth,
+    verbose, fan_in) - Disk based breadth first search from a TileBoard, or
+    from each board in a list.  Returns the number of states at each
+    depth.  See ExternalBFS.run."""
+    starts = start if isinstance(start, (list, tuple)) else [start]
+    boardsize = starts[0].boardsize
+    search = ExternalBFS(boardsize, workdir, buffer_states, fan_in)
+    return search.run(starts, distance_file, max_depth, verbose=verbose)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Disk based breadth first search from the goal")
+    parser.add_argument("boardsize", type=int)
+    parser.add_argument("workdir")
+    parser.add_argument("--buffer", type=int, default=1 << 20,
+                        help="states held in memory before writing a run")
+    parser.add_argument("--distances",
+                        help="write a distance file (see depth_of)")
+    parser.add_argument("--max-depth", type=int)
+    parser.add_argument("--fan-in", type=int, default=FAN_IN,
+                        help="most run files merged at once")
+    args = parser.parse_args()
+    n = args.boardsize * args.boardsize - 1
+    goal = TileBoard(n, force_state=list(range(1, n + 1)) + [None])
+    counts = external_bfs(goal, args.workdir, args.buffer, args.distances,
+                          args.max_depth, verbose=True, fan_in=args.fan_in)
+    print("{} states in {} layers".format(sum(counts), len(counts)))
@@ -1,51 +1,57 @@
-
-
-from basicsearch_lib02.tileboard import TileBoard
-from basicsearch_lib02.searchrep import Problem
-
-class NPuzzle(Problem):
-    """
-    NPuzzle - Problem representation for an N-tile puzzle
-    Provides implementations for Problem actions specific to N tile puzzles.
-    """
-    def __init__(self, n, force_state=None, **kwargs):
-        """"__init__(n, force_state, **kwargs)
-        
-        NPuzzle constructor.  Creates an initial TileBoard of size n.
-        If force_state is not None, the puzzle is initialized to the
-        specified state instead of being generated randomly.
-        
-        The parent's class constructor is then called with the TileBoard
-        instance any any remaining arguments captured in **kwargs.        
-        
-        """
-        
-        # Note on **kwargs:
-        # **kwargs is Python construct that captures any remaining arguments 
-        # into a dictionary.  The dictionary can be accessed like any other 
-        # dictionary, e.g. kwargs[“keyname”], or passed to another function 
-        # as if each entry was a keyword argument:
-        #    e.g. foobar(arg1, arg2, …, argn, **kwargs).
-
-        super().__init__(TileBoard(n, force_state = force_state), goals=None, **kwargs, **kwargs)
-
-        
-    def actions(self, state):
-        "actions(state) - find a set of actions applicable to specified state"
-        return state.get_actions()
-
-    
-    def result(self, state, action):
-        "result(state, action)- apply action to state and return new state"
-        return state.move(action)
-
-    
-    def goal_test(self, state):
-        "goal_test(state) - Is state a goal?"
-        return state.solved()
-
-    
-        
-
-
-
+
+
+from basicsearch_lib02.tileboard import TileBoard
+from basicsearch_lib02.searchrep import Problem
+
+class NPuzzle(Problem):
+    """
+    NPuzzle - Problem representation for an N-tile puzzle
+    Provides implementations for Problem actions specific to N tile puzzles.
+    """
+    def __init__(self, n, force_state=None, multiple_solutions=False,
+                 rng=None, **kwargs):
+        """"__init__(n, force_state, multiple_solutions, rng, **kwargs)
+        
+        NPuzzle constructor.  Creates an initial TileBoard of size n.
+        If force_state is not None, the puzzle is initialized to the
+        specified state.  Otherwise it is generated randomly with rng
+        (a random.Random), or the random module if rng is None.
+        With multiple_solutions, the blank may end up in any position.
+        
+        The parent's class constructor is then called with the TileBoard
+        instance any any remaining arguments captured in **kwargs.        
+        
+        """
+        
+        # Note on **kwargs:
+        # **kwargs is Python construct that captures any remaining arguments 
+        # into a dictionary.  The dictionary can be accessed like any other 
+        # dictionary, e.g. kwargs[“keyname”], or passed to another function 
+        # as if each entry was a keyword argument:
+        #    e.g. foobar(arg1, arg2, …, argn, **kwargs).
+
+        super().__init__(TileBoard(n, force_state = force_state,
+                                   multiple_solutions = multiple_solutions,
+                                   rng = rng),
+                         goals=None, **kwargs, **kwargs)
+
+        
+    def actions(self, state):
+        "actions(state) - find a set of actions applicable to specified state"
+        return state.get_actions()
+
+    
+    def result(self, state, action):
+        "result(state, action)- apply action to state and return new state"
+        return state.move(action)
+
+    
+    def goal_test(self, state):
+        "goal_test(state) - Is state a goal?"
+        return state.solved()
+
+    
+        
+
+
+
@@ -0,0 +1,252 @@
+"""
+patterndb - Additive disjoint pattern databases for N-puzzles
+
+A pattern is a subset of the tiles.  Its database records, for every
+placement of the pattern tiles on the board, the fewest moves of pattern
+tiles needed to bring them to their goal positions, ignoring all other
+tiles and the blank.  Only pattern tile moves are counted, so when the
+tiles are split into disjoint patterns the values of the individual
+databases can be added and the sum is still an admissible and
+consistent heuristic.
+
+Tables are built with a retrograde breadth-first search outward from the
+goal over placements of the pattern tiles and are indexed by their rank.
+Each entry is a single byte, so a k-tile pattern on a board of c cells
+takes c!/(c-k)! bytes.
+
+Building the 6-tile patterns used for the 15 puzzle (5.8 million entries
+each) is a long running offline job; build once and save() the result:
+    python patterndb.py 4 fifteen.npdb
+The 6-tile patterns of the 24 puzzle have 127 million entries each,
+which is not practical to build in Python.
+"""
+
+import math
+import struct
+import sys
+
+# Default disjoint partitions of the tiles by board size (blank last goal)
+PARTITIONS = {
+    # 4-4 split for the 8 puzzle
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    # 6-6-3 split for the 15 puzzle
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    # 6-6-6-6 split for the 24 puzzle
+    5: ((1, 2, 6, 7, 11, 12), (3, 4, 5, 8, 9, 10),
+        (16, 17, 18, 21, 22, 23), (13, 14, 15, 19, 20, 24)),
+}
+
+# File header:  magic, format version, board size, number of patterns
+MAGIC = b"NPDB"
+VERSION = 2  # version 1 tables minimized over blank positions
+UNSEEN = 255  # distance byte for placements not yet reached
+
+
+class PatternTable(object):
+    """
+    Distance table for a single pattern.  Entries are indexed by the
+    rank of the positions of the pattern tiles, taken in pattern order.
+    """
+
+    def __init__(self, boardsize, pattern, table=None):
+        """PatternTable(boardsize, pattern, table)
+        boardsize - number of rows (and columns)
+        pattern - sequence of tile numbers in the pattern
+        table - bytes of distances, normally produced by build() or read
+            from a file.  If None, the table must be built before use.
+        """
+        self.boardsize = boardsize
+        self.cells = boardsize * boardsize
+        self.pattern = tuple(pattern)
+        # Number of ways to place the pattern tiles on the board
+        self.size = math.perm(self.cells, len(self.pattern))
+        if table is not None and len(table) != self.size:
+            raise ValueError("Pattern table has %d entries, expected %d" % (
+                len(table), self.size))
+        self.table = table
+
+    def rank(self, positions):
+        """rank(positions) - Index of a placement of the pattern tiles
+
+        positions[i] is the board position of the i'th pattern tile.
+        Each position is replaced by the number of still unused positions
+        below it and the resulting digits are read as a mixed radix number.
+        """
+        rank = 0
+        used = 0
+        radix = self.cells
+        for position in positions:
+            smaller = position - bin(used & ((1 << position) - 1)).count("1")
+            rank = rank * radix + smaller
+            radix -= 1
+            used |= 1 << position
+        return rank
+
+    def unrank(self, rank):
+        "unrank(rank) - Positions of the pattern tiles for a rank"
+        k = len(self.pattern)
+        digits = [0] * k
+        for i in range(k - 1, -1, -1):
+            rank, digits[i] = divmod(rank, self.cells - i)
+        free = list(range(self.cells))
+        return [free.pop(digit) for digit in digits]
+
+    def build(self, verbose=False):
+        """build(verbose) - Compute the distance table
+
+        Breadth-first search from the goal over placements of the pattern
+        tiles alone:  a pattern tile may move to any adjacent cell that no
+        other pattern tile occupies, at a cost of one, and the blank and
+        the other tiles are ignored.  A real move moves one tile by one
+        cell, so it changes the sum over disjoint patterns by at most one
+        and the heuristic is consistent.
+
+        No layers are kept.  The states at a depth are found by scanning
+        the table for that distance, so the table is all the memory used.
+        The rank of a neighboring placement is derived from the rank being
+        expanded:  moving tile i from cell p to cell q shifts its digit
+        (see rank) by q - p less the earlier pattern tiles between p and q,
+        and the digit of each later pattern tile between them by one.
+        """
+        cells = self.cells
+        size = self.boardsize
+        k = len(self.pattern)
+        # Place value of each digit of a rank
+        weights = [math.perm(cells - i - 1, k - i - 1) for i in range(k)]
+        # (neighbor, cells strictly between) for each cell
+        neighbors = [
+            [(p, range(min(p, pos) + 1, max(p, pos)))
+             for p in (pos - size, pos + size) if 0 <= p < cells] +
+            [(p, ()) for p in (pos - 1, pos + 1) if p // size == pos // size]
+            for pos in range(cells)]
+
+        distance = bytearray([UNSEEN]) * self.size
+        distance[self.rank([tile - 1 for tile in self.pattern])] = 0
+        depth = 0
+        count = 1
+        while count:
+            if depth + 1 >= UNSEEN:
+                raise ValueError("Pattern distances do not fit in a byte")
+            marker = bytes([depth])
+            count = 0
+            index = distance.find(marker)
+            while index != -1:
+                positions = self.unrank(index)
+                # cell -> index of the pattern tile on it
+                occupied = {position: i for i, position in enumerate(positions)}
+                for i, position in enumerate(positions):
+                    for (neighbor, between) in neighbors[position]:
+                        if neighbor in occupied:
+                            continue
+                        shift = abs(neighbor - position) * weights[i]
+                        for cell in between:
+                            j = occupied.get(cell)
+                            if j is not None:
+                                shift += -weights[i] if j < i else weights[j]
+                        if neighbor > position:
+                            child = index + shift
+                        else:
+                            child = index - shift
+                        if distance[child] == UNSEEN:
+                            distance[child] = depth + 1
+                            count += 1
+                index = distance.find(marker, index + 1)
+            depth += 1
+            if verbose:
+                print("pattern {} depth {}: {} states".format(
+                    self.pattern, depth, count))
+        self.table = bytes(distance)
+        return self
+
+    def lookup(self, where):
+        """lookup(where) - Distance for a board where where[tile] is the
+        position of each tile"""
+        return self.table[self.rank([where[tile] for tile in self.pattern])]
+
+
+class AdditivePatternDatabase(object):
+    """
+    A set of disjoint pattern tables whose values are summed to give
+    an admissible heuristic for the blank last goal.
+    """
+
+    def __init__(self, boardsize, partition=None, tables=None):
+        """AdditivePatternDatabase(boardsize, partition, tables)
+        boardsize - number of rows (and columns)
+        partition - disjoint tuples of tiles, defaults to PARTITIONS entry
+        tables - PatternTable instances, used instead of partition if given
+        """
+        self.boardsize = boardsize
+        if tables is None:
+            if partition is None:
+                partition = PARTITIONS[boardsize]
+            tables = [PatternTable(boardsize, pattern)
+                      for pattern in partition]
+        self.tables = list(tables)
+
+        # Check that the patterns do not overlap
+        seen = set()
+        for table in self.tables:
+            if seen.intersection(table.pattern):
+                raise ValueError("Patterns must be disjoint")
+            seen.update(table.pattern)
+
+    @classmethod
+    def build(cls, boardsize, partition=None, verbose=False):
+        "build(boardsize, partition, verbose) - Build all pattern tables"
+        database = cls(boardsize, partition)
+        for table in database.tables:
+            table.build(verbose)
+        return database
+
+    def h(self, tiles):
+        "h(tiles) - Sum of pattern distances for a row major tile sequence"
+        where = [0] * len(tiles)
+        for position, tile in enumerate(tiles):
+            if tile is not None:
+                where[tile] = position
+        value = 0
+        for table in self.tables:
+            value += table.lookup(where)
+        return value
+
+    def save(self, filename):
+        "save(filename) - Write the database to a binary file"
+        with open(filename, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<BBB", VERSION, self.boardsize,
+                                len(self.tables)))
+            for table in self.tables:
+                f.write(struct.pack("<B", len(table.pattern)))
+                f.write(bytes(table.pattern))
+                f.write(table.table)
+
+    @classmethod
+    def load(cls, filename):
+        "load(filename) - Read a database written by save()"
+        with open(filename, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("%s is not a pattern database" % filename)
+            version, boardsize, count = struct.unpack("<BBB", f.read(3))
+            if version != VERSION:
+                raise ValueError("Unsupported pattern database version %d"
+                                 % version)
+            tables = []
+            for _ in range(count):
+                (k,) = struct.unpack("<B", f.read(1))
+                pattern = tuple(f.read(k))
+                table = PatternTable(boardsize, pattern)
+                table.table = f.read(table.size)
+                if len(table.table) != table.size:
+                    raise ValueError("%s is truncated" % filename)
+                tables.append(table)
+        return cls(boardsize, tables=tables)
+
+
+if __name__ == "__main__":
+    # python patterndb.py boardsize filename
+    if len(sys.argv) != 3:
+        print("usage: python patterndb.py boardsize filename")
+        sys.exit(1)
+    database = AdditivePatternDatabase.build(int(sys.argv[1]), verbose=True)
+    database.save(sys.argv[2])
@@ -1,126 +1,907 @@
-'''
-problemsearch - Functions for seaarching.
-'''
-
-from collections import deque
-from typing import Deque
-from basicsearch_lib02.searchrep import (Node, print_nodes)
-from basicsearch_lib02.queues import PriorityQueue
-from basicsearch_lib02.timer import Timer
-from basicsearch_lib02.tileboard import TileBoard
-from explored import Explored
-    
-"""graph_search(problem, verbose, debug) - Given a problem representation
-    (instance of basicsearch_lib02.representation.Problem or derived class),
-    attempt to solve the problem.
-    
-    If debug is True, debugging information will be displayed.
-    
-    if verbose is True, the following information will be displayed:
-        
-        Number of moves to solution
-        List of moves and resulting puzzle states
-        Example:
-        
-            Solution in 25 moves        
-            Initial state
-                  0        1        2    
-            0     4        8        7    
-            1     5        .        2    
-            2     3        6        1    
-            Move 1 -  [0, -1]
-                  0        1        2    
-            0     4        8        7    
-            1     .        5        2    
-            2     3        6        1    
-            Move 2 -  [1, 0]
-                  0        1        2    
-            0     4        8        7    
-            1     3        5        2    
-            2     .        6        1    
-            
-            ... more moves ...
-            
-                  0        1        2    
-            0     1        3        5    
-            1     4        2        .    
-            2     6        7        8    
-            Move 22 -  [-1, 0]
-                  0        1        2    
-            0     1        3        .    
-            1     4        2        5    
-            2     6        7        8    
-            Move 23 -  [0, -1]
-                  0        1        2    
-            0     1        .        3    
-            1     4        2        5    
-            2     6        7        8    
-            Move 24 -  [1, 0]
-                  0        1        2    
-            0     1        2        3    
-            1     4        .        5    
-            2     6        7        8    
-        
-        If no solution were found (not possible with the puzzles we
-        are using), we would display:
-        
-            No solution found
-    
-    Returns a tuple (path, nodes_explored, elapsed_s) where:
-    path - list of actions to solve the problem or None if no solution was found
-    nodes_explored - Number of nodes explored (dequeued from frontier)
-    elapsed_s is the elapsed wall clock time performing the search
-    """
-       
-def graph_search(problem, verbose=False, debug=False):
-      #Set Timer
-      timer = Timer()
-      #I am creating a variable frontier as a PriorityQueue to store all the current states
-      frontier = PriorityQueue()
-      #I am creating a variable exploredStates a hashtable to store all explored states
-      exploredStates = Explored()
-      #This will initialize the frontier with the first Node
-      frontier.append(Node(problem, problem.initial))
-
-      
-      #I am using a while loop in order for the code to keep running until a solution is found.
-      while frontier.__len__() != 0:
-
-            #This will pop a node from the frontier.
-            node = frontier.pop()
-
-            if debug:
-                  print('The node that was just popped is: ', str(node))
-            #print(node)
-            #print(frontier.__len__())
-
-
-            if problem.goal_test(node.state):
-                  #Instantiate variables nodeSolvePath and actions to save our node.path() for printing and our actions for more information.
-                  nodeSolvePath = node.path()
-                  actions = node.solution()
-                  
-                  # If verbose is True, display all moves that happened.
-                  if verbose:
-                        #Formatted to print out how many moves it took, and which moves it took and the path that occurred.
-                        print(f'Solution in {len(actions)} moves')
-                        for i in range(len(actions)):
-                              print(f'Move {i + 1} - {actions[i]}')
-                              print(nodeSolvePath[i + 1].state, end='\n\n')
-
-                  #The function will return a tuple containing a solution path, the amount of nodes explored, and the time is took in secs.
-                  return nodeSolvePath, len(exploredStates.hash_map), timer.elapsed_s()
-
-            else:
-                  # Explore the children of current node that we are at.
-                  for child in node.expand(problem):
-
-                        child_tuple = child.state.state_tuple()
-
-                        #If the child hasn't been explored yet, we will then load it into frontier and explore the set. 
-                        if not exploredStates.exists(child_tuple):
-                              exploredStates.add(child_tuple)
-                              frontier.append(child)
-
-      # If no solution found, return None
-      return None
\ No newline at end of file
+'''
+problemsearch - Functions for seaarching.
+'''
+
+import time
+from collections import deque
+from heapq import (heappush, heappop)
+from typing import Deque
+from basicsearch_lib02.searchrep import (Node, Problem, print_nodes, MOVES,
+                                         expand_layer)
+from basicsearch_lib02.queues import PriorityQueue
+from basicsearch_lib02.timer import Timer
+from basicsearch_lib02.tileboard import (TileBoard, MutableTileBoard,
+                                         unpack, tile_bits)
+from explored import Explored
+import symmetry
+from searchstats import NullStats
+    
+"""graph_search(problem, verbose, debug) - Given a problem representation
+    (instance of basicsearch_lib02.representation.Problem or derived class),
+    attempt to solve the problem.
+    
+    If debug is True, debugging information will be displayed.
+    
+    if verbose is True, the following information will be displayed:
+        
+        Number of moves to solution
+        List of moves and resulting puzzle states
+        Example:
+        
+            Solution in 25 moves        
+            Initial state
+                  0        1        2    
+            0     4        8        7    
+            1     5        .        2    
+            2     3        6        1    
+            Move 1 -  [0, -1]
+                  0        1        2    
+            0     4        8        7    
+            1     .        5        2    
+            2     3        6        1    
+            Move 2 -  [1, 0]
+                  0        1        2    
+            0     4        8        7    
+            1     3        5        2    
+            2     .        6        1    
+            
+            ... more moves ...
+            
+                  0        1        2    
+            0     1        3        5    
+            1     4        2        .    
+            2     6        7        8    
+            Move 22 -  [-1, 0]
+                  0        1        2    
+            0     1        3        .    
+            1     4        2        5    
+            2     6        7        8    
+            Move 23 -  [0, -1]
+                  0        1        2    
+            0     1        .        3    
+            1     4        2        5    
+            2     6        7        8    
+            Move 24 -  [1, 0]
+                  0        1        2    
+            0     1        2        3    
+            1     4        .        5    
+            2     6        7        8    
+        
+        If no solution were found (not possible with the puzzles we
+        are using), we would display:
+        
+            No solution found
+    
+    If bidirectional is True, bidirectional_search is used instead.  It
+    takes stats, but not explored, packed, symmetric or reopen, for which
+    ValueError is raised.
+
+    If packed is True, packed_search is used instead.  It finds plans of
+    the same length while keeping much less in memory.
+
+    Duplicates are handled as A* requires:  a node is closed (added to the
+    explored set) when it is expanded, and a child whose state waits in the
+    frontier replaces the queued node only if it has a smaller g.  Children
+    whose state is closed are dropped, unless reopen is True and the child
+    has a smaller g than the closed node, in which case the state is queued
+    again.  Reopening keeps plans optimal with admissible heuristics that
+    are not consistent.
+
+    explored is an empty explored set to use in place of explored.Explored,
+    e.g. explored.compact_explored(boardsize) for N-puzzles whose boards
+    are reachable from the blank last goal (see compact_explored).
+
+    If symmetric is True, a board and its mirror image along the main
+    diagonal (see symmetry) are treated as the same state by the explored
+    set and the frontier, so at most one of them is expanded.  They are
+    the same distance from the goal, so plans stay optimal.  Nodes keep
+    their actual boards, so the plan is the real one.  Only for the blank
+    last goal.  A heuristic must give a board and its mirror image the same
+    value; unless its strategy class sets mirror_symmetric, as Manhattan,
+    LinearConflict and WalkingDistance do, h is evaluated on both boards
+    and the larger value is used (see mirror_max_h).
+
+    Symmetry only pays off where a search reaches both a board and its
+    mirror image, i.e. with weak or no heuristics:  breadth first search
+    of 8 puzzles expands about 28% fewer boards and runs about 13% faster.
+    A* with Manhattan rarely meets both; it expands about 2% fewer boards
+    on 8 puzzles and about 0.03% fewer on 15 puzzles, and runs 1.15 to
+    1.5 times slower, as every child is put in canonical form.
+
+    stats is an optional searchstats.SearchStats that is updated with
+    counters and phase times as the search runs.  Without it a
+    searchstats.NullStats is used, which only counts expansions.  The
+    search still makes its (empty) calls and reads its zero clock, a
+    small cost per node, within the noise of timing a search.
+
+    Returns a tuple (path, nodes_explored, elapsed_s) where:
+    path - list of actions to solve the problem or None if no solution was found
+    nodes_explored - Number of nodes explored (dequeued from frontier and expanded)
+    elapsed_s is the elapsed wall clock time performing the search
+    """
+       
+def graph_search(problem, verbose=False, debug=False, bidirectional=False,
+                 explored=None, stats=None, packed=False, reopen=False,
+                 symmetric=False):
+      #With bidirectional set, search from both ends and meet in the middle instead.
+      if bidirectional:
+            if explored is not None or packed or symmetric or reopen:
+                  raise ValueError("Bidirectional search does not support explored, packed, symmetric or reopen")
+            return bidirectional_search(problem, verbose, debug, stats)
+      #In symmetric mode, a state and its mirror image are looked up by the same canonical tuple.
+      canonical = None
+      if symmetric:
+            if not symmetry.blank_last(problem.initial):
+                  raise ValueError("Symmetric search needs the blank last goal")
+            canonical = lambda state: symmetry.canonical_tiles(state.tiles, state.boardsize)
+      #With packed set, search over packed integer states instead of nodes.
+      if packed:
+            return packed_search(problem, verbose, debug, reopen, symmetric, stats)
+      #Set Timer
+      timer = Timer()
+      #I am creating a variable exploredStates a hashtable to store all explored states, unless one was given.
+      exploredStates = Explored() if explored is None else explored
+      #When reopening, I am keeping the g each explored state was expanded with.
+      closedG = {} if reopen else None
+      #I am looking states up by their tuple, or by the canonical tuple in symmetric mode.
+      if canonical is None:
+            canonical = lambda state: state.state_tuple()
+      #Without a stats object, one whose methods do nothing but count expansions is used, so there is a single loop for both.
+      if stats is None:
+            stats = NullStats()
+      clock = stats.clock
+      times = stats.times
+      #Heuristic evaluation is timed by wrapping the problem's heuristic for the duration of the search.
+      h = problem.h
+      #In symmetric mode, a board and its mirror image have to get the same h.
+      if symmetric:
+            problem.h = mirror_max_h(problem.initial, h)
+      if stats.timing:
+            problem.h = stats.timed("heuristic", problem.h)
+      try:
+            #I am creating a variable frontier as a PriorityQueue to store all the current states
+            frontier = PriorityQueue(key=lambda node: canonical(node.state))
+            #This will initialize the frontier with the first Node
+            frontier.append(Node(problem, problem.initial))
+            stats.frontier(1)
+
+            #I am using a while loop in order for the code to keep running until a solution is found.
+            while len(frontier) != 0:
+
+                  #This will pop a node from the frontier.
+                  start = clock()
+                  node = frontier.pop()
+                  times["queue"] += clock() - start
+
+                  if debug:
+                        print('The node that was just popped is: ', str(node))
+
+                  if problem.goal_test(node.state):
+                        #The function will return a tuple containing a solution path, the amount of nodes explored, and the time is took in secs.
+                        return _report(problem, node, verbose), stats.expansions, timer.elapsed_s()
+
+                  stats.expand(node)
+                  #The node is explored (closed) now that it is being expanded.
+                  start = clock()
+                  node_tuple = canonical(node.state)
+                  exploredStates.add(node_tuple)
+                  if reopen:
+                        closedG[node_tuple] = node.g
+                  times["explored"] += clock() - start
+                  #Expansion time leaves out the heuristic, which is timed on its own.
+                  heuristic = times["heuristic"]
+                  start = clock()
+                  children = node.expand(problem)
+                  times["expand"] += clock() - start - (times["heuristic"] - heuristic)
+                  # Explore the children of current node that we are at.
+                  for child in children:
+                        stats.generate(child)
+                        child_tuple = canonical(child.state)
+
+                        #If the child was already explored, we skip it unless we are reopening and found a cheaper path.
+                        start = clock()
+                        closed = exploredStates.exists(child_tuple)
+                        times["explored"] += clock() - start
+                        if closed:
+                              if not reopen or child.g >= closedG[child_tuple]:
+                                    stats.duplicate(child)
+                                    continue
+                              stats.reopen(child)
+                        #If the child is already waiting in the frontier, we keep whichever of the two has the smaller g.
+                        start = clock()
+                        queued = frontier[child]
+                        if queued is not None:
+                              if queued.g <= child.g:
+                                    times["queue"] += clock() - start
+                                    stats.duplicate(child)
+                                    continue
+                              del frontier[child]
+                        frontier.append(child)
+                        times["queue"] += clock() - start
+                  stats.frontier(len(frontier))
+
+                  #The board of an expanded node is not needed anymore, the root keeps its board to rebuild the path from.
+                  if node.parent is not None:
+                        node.release()
+
+            # If no solution found, return None
+            return None
+      finally:
+            problem.h = h
+
+
+def _report(problem, node, verbose):
+    """_report(problem, node, verbose) - Path from the root to a goal node,
+    with the moves displayed if verbose is True"""
+    #Instantiate variables nodeSolvePath and actions to save our node.path() for printing and our actions for more information.
+    nodeSolvePath = node.path(problem)
+    actions = node.solution()
+    # If verbose is True, display all moves that happened.
+    if verbose:
+        #Formatted to print out how many moves it took, and which moves it took and the path that occurred.
+        print(f'Solution in {len(actions)} moves')
+        for i in range(len(actions)):
+            print(f'Move {i + 1} - {actions[i]}')
+            print(nodeSolvePath[i + 1].state, end='\n\n')
+    return nodeSolvePath
+
+
+def solution_path(problem, actions, verbose=False):
+    """solution_path(problem, actions, verbose) - Replay a list of actions
+    from problem.initial and return the list of search nodes visited, as
+    graph_search does.  If verbose is True, the moves are displayed in the
+    same format as graph_search.
+    """
+    node = Node(problem, problem.initial)
+    for action in actions:
+        node = node.child_node(problem, action)
+    path = node.path()
+    if verbose:
+        print(f'Solution in {len(actions)} moves')
+        for i in range(len(actions)):
+            print(f'Move {i + 1} - {actions[i]}')
+            print(path[i + 1].state, end='\n\n')
+    return path
+
+
+class _Probe(object):
+    """Stand-in for a search Node used by engines that do not build Nodes.
+    Carries what heuristics read from a Node:  the state, the parent probe
+    (for its h), the action from the parent, and the depth."""
+    __slots__ = ('state', 'parent', 'action', 'depth', 'h', 'hcache')
+
+    def __init__(self, state, parent=None, action=None, depth=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.depth = depth
+        self.h = 0
+        self.hcache = None
+
+
+def mirror_max_h(template, h):
+    """mirror_max_h(template, h) - Heuristic that gives a board and its
+    mirror image (see symmetry) the same value, for symmetric searches.
+    h itself if its strategy class sets mirror_symmetric, otherwise the
+    larger of h on the board and on its mirror image.  Mirror images are
+    the same distance from the goal, so that is still admissible, and
+    consistent if h is.  Boards are built like those of template, a
+    TileBoard with the blank last goal, and evaluated without a parent."""
+    if getattr(getattr(h, "__self__", None), "mirror_symmetric", False):
+        return h
+    boardsize = template.boardsize
+
+    def symmetric_h(searchnode):
+        tiles = tuple(searchnode.state.tiles)
+        mirrored = symmetry.mirror_tiles(tiles, boardsize)
+        return max(h(_Probe(template._derive(tiles, tiles.index(None)))),
+                   h(_Probe(template._derive(mirrored, mirrored.index(None)))))
+    return symmetric_h
+
+
+def ida_search(problem, verbose=False, debug=False):
+    """ida_search(problem, verbose, debug) - Iterative deepening A*
+
+    Repeated depth first searches, each cut off where g + h exceeds a bound
+    that starts at h of the initial state and rises to the smallest f that
+    was cut off in the previous pass.  With an admissible problem.h (g is
+    the number of moves) the first solution found is optimal.  Heuristics
+    with negative values, e.g. DepthFirst, are not suitable.
+
+    Memory is proportional to the solution depth:  the search runs on an
+    explicit stack over a single MutableTileBoard whose moves are made and
+    unmade in place, and never undoes the move it just made.
+
+    Returns the same (path, nodes_explored, elapsed_s) tuple as graph_search,
+    with nodes_explored counting expansions over all passes.
+    """
+    timer = Timer()
+    board = MutableTileBoard(problem.initial)
+    boardsize = board.boardsize
+
+    # Legal moves for each position of the blank
+    moves = []
+    for blank in range(boardsize * boardsize):
+        (r, c) = divmod(blank, boardsize)
+        moves.append([[dr, dc] for (dr, dc) in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                      if 0 <= r + dr < boardsize and 0 <= c + dc < boardsize])
+
+    # probes[d] describes the board at depth d of the current line of play
+    # and choices[d] is the next of its moves to try
+    probes = [_Probe(board)]
+    probes[0].h = problem.h(probes[0])
+    bound = probes[0].h
+    explored = 0
+    while True:
+        if debug:
+            print(f'IDA* pass with bound {bound}, {explored} nodes so far')
+        nextbound = None
+        choices = [0]
+        del probes[1:]
+        while choices:
+            depth = len(choices) - 1
+            probe = probes[depth]
+            options = moves[board.blank]
+            choice = choices[depth]
+            if choice == 0:
+                # First visit, cut off, test and count
+                f = depth + probe.h
+                if f > bound:
+                    if nextbound is None or f < nextbound:
+                        nextbound = f
+                    choice = len(options)
+                elif problem.goal_test(board):
+                    actions = [list(p.action) for p in probes[1:depth + 1]]
+                    return (solution_path(problem, actions, verbose),
+                            explored, timer.elapsed_s())
+                else:
+                    explored += 1
+            if choice >= len(options):
+                # Done here, back up to the parent
+                choices.pop()
+                if depth > 0:
+                    board.unmake(probe.action)
+                continue
+            choices[depth] = choice + 1
+            offset = options[choice]
+            if depth > 0 and offset[0] == -probe.action[0] and \
+                    offset[1] == -probe.action[1]:
+                continue  # would undo the previous move
+            board.make(offset)
+            # reuse probes deeper in the stack from earlier lines of play
+            if depth + 1 < len(probes):
+                child = probes[depth + 1]
+                child.action = offset
+            else:
+                child = _Probe(board, probe, offset, depth + 1)
+                probes.append(child)
+            child.h = problem.h(child)
+            choices.append(0)
+        if nextbound is None:
+            # Whole space searched without finding a goal
+            return None
+        bound = nextbound
+
+
+def packed_search(problem, verbose=False, debug=False, reopen=False,
+                  symmetric=False, stats=None):
+    """packed_search(problem, verbose, debug, reopen, symmetric, stats) -
+    graph_search for N-puzzles over states packed into ints (see
+    tileboard.pack)
+
+    Frontier entries are (f, tiebreak, g, packed state, key) tuples on a
+    heap, with ties dequeued first in first out as in graph_search.  The
+    best way found to reach each state is kept in a side table, key ->
+    (parent packed state, move code, depth, g), where key is the packed
+    state, or its canonical form with symmetric.  A cheaper path to a state
+    replaces its table entry and queues the state again; the entry it
+    supersedes is skipped when popped (lazy deletion).  Expanded states
+    are closed, and reopened only if reopen is True, as in graph_search.
+    Children are derived arithmetically from the packed parent.  Their h is
+    computed on a single MutableTileBoard through probes that carry the
+    parent's h, so incremental heuristics work as with Nodes.  Nodes and
+    TileBoards are only built for the solution path.
+
+    With symmetric, the side table and closed set are keyed by the smaller
+    packed state of a board and its mirror image, as in graph_search.  The
+    frontier holds actual boards, and when the plan is read back from the
+    side table, moves are mirrored wherever the path switches to a mirror
+    image.  Heuristics are made to give both the same value as in
+    graph_search.
+
+    stats, a searchstats.SearchStats, only gets counters; events are
+    reported with probes in place of nodes, and the frontier size
+    includes superseded heap entries.
+
+    The goals are those of problem.initial; problem.goal_test is not used.
+
+    Returns the same (path, nodes_explored, elapsed_s) tuple as graph_search.
+    """
+    timer = Timer()
+    board = MutableTileBoard(problem.initial)
+    boardsize = board.boardsize
+    bits = tile_bits(boardsize)
+
+    # (move code, cell the blank moves to) of the legal moves for each
+    # position of the blank, in the order of TileBoard.get_actions
+    moves = []
+    for blank in range(boardsize * boardsize):
+        (r, c) = divmod(blank, boardsize)
+        moves.append([(code, blank + dr * boardsize + dc)
+                      for (code, (dr, dc)) in enumerate(MOVES)
+                      if 0 <= r + dr < boardsize and 0 <= c + dc < boardsize])
+    goals = problem.initial.packed_goals()
+
+    def keyof(state):
+        "Side table and closed set key of a packed state"
+        if symmetric:
+            return symmetry.canonical_packed(state, boardsize)
+        return state
+
+    def successor(state, code):
+        "Packed state reached from a packed state by a move"
+        tiles = unpack(state, boardsize)
+        blank = tiles.index(None)
+        (delta_r, delta_c) = MOVES[code]
+        target = blank + delta_r * boardsize + delta_c
+        tile = tiles[target]
+        return state + (tile << blank * bits) - (tile << target * bits)
+
+    h = mirror_max_h(problem.initial, problem.h) if symmetric else problem.h
+
+    # Probes for the state being expanded and for each of its children
+    parent = _Probe(board)
+    child = _Probe(board, parent)
+    parent.h = h(parent)
+    start = problem.initial.packed()
+    links = {keyof(start): (None, None, 0, 0)}
+    closed = set()
+    frontier = [(parent.h, 0, 0, start, keyof(start))]
+    count = 1
+    explored = 0
+    while frontier:
+        (f, _, g, state, key) = heappop(frontier)
+        link = links[key]
+        if g > link[3] or (g == link[3] and key in closed):
+            continue  # superseded by a cheaper path
+        if debug:
+            print(f'Popped f={f} g={g}', unpack(state, boardsize))
+        if state in goals:
+            # Moves from state to the goal, last one first
+            actions = []
+            while True:
+                (previous, code, _, _) = links[keyof(state)]
+                # Board the side table entry was made for
+                reached = start if previous is None else \
+                    successor(previous, code)
+                if reached != state:
+                    # state is its mirror image, so are the moves from it
+                    actions = [symmetry.mirror_action(action)
+                               for action in actions]
+                if previous is None:
+                    break
+                actions.append(list(MOVES[code]))
+                state = previous
+            actions.reverse()
+            return (solution_path(problem, actions, verbose), explored,
+                    timer.elapsed_s())
+
+        explored += 1
+        closed.add(key)
+        if stats is not None:
+            stats.expand(parent)
+        tiles = unpack(state, boardsize)
+        blank = tiles.index(None)
+        board.tiles = list(tiles)
+        board.blank = blank
+        parent.depth = link[2]
+        parent.h = f - g
+        parent.hcache = None
+        child.depth = parent.depth + 1
+        for (code, target) in moves[blank]:
+            # The tile at target slides into the blank
+            tile = tiles[target]
+            packed = state + (tile << blank * bits) - (tile << target * bits)
+            action = MOVES[code]
+            board.make(action)
+            child.action = action
+            if stats is not None:
+                stats.generate(child)
+            childg = problem.g(parent, action, child)
+            childkey = keyof(packed)
+            previous = links.get(childkey)
+            if previous is not None and (childg >= previous[3] or
+                                         (not reopen and childkey in closed)):
+                board.unmake(action)
+                if stats is not None:
+                    stats.duplicate(child)
+                continue
+            if stats is not None and childkey in closed:
+                stats.reopen(child)
+            closed.discard(childkey)
+            child.h = h(child)
+            board.unmake(action)
+            links[childkey] = (state, code, child.depth, childg)
+            heappush(frontier, (childg + child.h, count, childg, packed,
+                                childkey))
+            count += 1
+        if stats is not None:
+            stats.frontier(len(frontier))
+    return None
+
+
+def ara_search(problem, time_budget_s=1.0, weight=3.0, weight_step=0.5,
+               verbose=False, debug=False, on_solution=None):
+    """ara_search(problem, time_budget_s, weight, weight_step, verbose,
+    debug, on_solution) - Anytime repairing A* (ARA*)
+
+    A series of weighted A* searches ordered by g + weight * h.  The first
+    uses the given weight and finds a plan quickly.  Each following search
+    lowers the weight by weight_step, down to 1, and continues from the
+    previous one rather than starting over:  states whose g improved after
+    they were expanded are put back in the frontier, all others stay
+    closed.  The search stops when a weight 1 pass completes, in which case
+    the plan is optimal, or when time_budget_s seconds have passed.
+
+    Each time a pass finds a better plan or proves a tighter bound,
+    on_solution(path, bound, elapsed_s) is called if given, where bound is
+    a proven factor by which the plan may be longer than an optimal one
+    (1 means optimal):  the smaller of the weight of the last completed
+    pass and the plan's cost over the smallest g + h still waiting, or
+    inf if nothing has been proven yet.
+    Bounds assume problem.h is consistent, as Manhattan and LinearConflict
+    are.  If verbose is True, the bounds and the final plan are displayed.
+
+    The deadline is also checked while the waiting states are scanned for
+    the bound and while the frontier is reordered between passes, so large
+    frontiers do not overrun time_budget_s.  A scan cut short proves
+    nothing, so the bound is then that of the last completed pass.
+
+    Returns (path, nodes_explored, elapsed_s, bound) for the best plan
+    found, the first three as in graph_search and bound as last passed to
+    on_solution, or None if no plan was found within the time budget.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget_s
+    weight = max(weight, 1.0)
+    root = Node(problem, problem.initial)
+    best = {problem.initial.state_tuple(): root}  # state -> best node found
+    # Order by g + weight * h, ties toward the node closer to a goal
+    priority = lambda node: (node.g + weight * node.h, node.h)
+    frontier = PriorityQueue(f=priority)
+    frontier.append(root)
+    inconsistent = {}  # state -> closed node whose g has since improved
+    incumbent = root if problem.goal_test(root.state) else None
+    bound = float('inf')  # proven factor of the incumbent over optimal
+    reported = None  # (cost, bound) last reported
+    explored = 0
+    out_of_time = False
+    while True:
+        closed = set()
+        # Improve the plan with the current weight
+        while frontier and (incumbent is None or
+                            frontier.f(frontier.peek())[0] < incumbent.g):
+            if time.perf_counter() > deadline:
+                out_of_time = True
+                break
+            node = frontier.pop()
+            if debug:
+                print(f'weight {weight} expanding', node)
+            explored += 1
+            closed.add(node.state.state_tuple())
+            for child in node.expand(problem):
+                child_tuple = child.state.state_tuple()
+                previous = best.get(child_tuple)
+                if previous is not None and previous.g <= child.g:
+                    continue
+                best[child_tuple] = child
+                if incumbent is None or child.g < incumbent.g:
+                    if problem.goal_test(child.state):
+                        incumbent = child
+                if child_tuple in closed:
+                    inconsistent[child_tuple] = child
+                else:
+                    del frontier[child]
+                    frontier.append(child)
+            if node.parent is not None:
+                node.release()
+
+        # Smallest g + h still waiting, None if the deadline passed first
+        waiting = list(frontier) + list(inconsistent.values())
+        lower = float('inf')
+        for node in waiting:
+            if time.perf_counter() > deadline:
+                out_of_time = True
+                lower = None
+                break
+            lower = min(lower, node.g + node.h)
+        if incumbent is not None:
+            if lower is not None and incumbent.g <= lower:
+                bound = 1.0
+            elif lower is not None:
+                if lower > 0:
+                    bound = min(bound, incumbent.g / lower)
+                if not out_of_time:
+                    # A completed pass also proves its weight
+                    bound = min(bound, weight)
+            if reported != (incumbent.g, bound):
+                reported = (incumbent.g, bound)
+                elapsed = time.perf_counter() - started
+                if verbose:
+                    print(f'Plan of {incumbent.g} moves within a factor '
+                          f'{bound:.3f} of optimal after {elapsed:.3f} s')
+                if on_solution is not None:
+                    on_solution(incumbent.path(problem), bound, elapsed)
+            if bound <= 1.0:
+                break
+        if out_of_time or weight <= 1.0 or not waiting:
+            break
+
+        # Tighten the weight, reopen improved states and reorder
+        weight = max(1.0, weight - weight_step)
+        inconsistent = {}
+        frontier = PriorityQueue(f=priority)
+        for node in waiting:
+            if time.perf_counter() > deadline:
+                out_of_time = True
+                break
+            frontier.append(node)
+        if out_of_time:
+            break
+
+    if incumbent is None:
+        return None
+    return (_report(problem, incumbent, verbose), explored,
+            time.perf_counter() - started, bound)
+
+
+def beam_search(problem, width=100, f=None, max_depth=None, verbose=False,
+                debug=False, stats=None):
+    """beam_search(problem, width, f, max_depth, verbose, debug, stats) -
+    Search for a plan quickly, without a guarantee that it is optimal.
+
+    The search advances one depth at a time and keeps only the width best
+    nodes of each depth, those with the smallest f(node), or node.h if f
+    is None.  Nodes that tie keep the order they were generated in, so
+    the search is deterministic.  A child is dropped if its state was
+    kept at an earlier depth, which keeps the beam from cycling.  Only
+    kept states are remembered, expanded nodes are released (see
+    Node.release) and the rest of a depth is dropped once the next depth
+    has been chosen, so memory grows by at most width states per depth.
+
+    The search fails if every node of a depth is pruned or max_depth is
+    passed.  stats, a searchstats.SearchStats, only gets counters; its
+    frontier is the beam.  Returns the same (path, nodes_explored,
+    elapsed_s) tuple as graph_search, or None if no plan was found.
+    """
+    if width < 1:
+        raise ValueError("width must be positive")
+    timer = Timer()
+    score = (lambda node: node.h) if f is None else f
+    root = Node(problem, problem.initial)
+    if problem.goal_test(root.state):
+        return (_report(problem, root, verbose), 0, timer.elapsed_s())
+    beam = [root]
+    kept = {root.state.state_tuple()}  # states of every node kept so far
+    explored = 0
+    depth = 0
+    if stats is not None:
+        stats.frontier(1)
+    while beam and (max_depth is None or depth < max_depth):
+        if stats is not None:
+            for node in beam:
+                stats.expand(node)
+        children = {}  # state -> first child found for it
+        for child in expand_layer(beam, problem):
+            if stats is not None:
+                stats.generate(child)
+            child_tuple = child.state.state_tuple()
+            if child_tuple in kept or child_tuple in children:
+                if stats is not None:
+                    stats.duplicate(child)
+                continue
+            if problem.goal_test(child.state):
+                return (_report(problem, child, verbose),
+                        explored + len(beam), timer.elapsed_s())
+            children[child_tuple] = child
+        explored += len(beam)
+        for node in beam:
+            if node.parent is not None:
+                node.release()
+        # sorted is stable, ties stay in the order they were generated
+        beam = sorted(children.values(), key=score)[:width]
+        kept.update(node.state.state_tuple() for node in beam)
+        if stats is not None:
+            stats.frontier(len(beam))
+        depth += 1
+        if debug:
+            print(f'Depth {depth}: kept {len(beam)} of {len(children)}',
+                  f'best score {score(beam[0]) if beam else None}')
+    return None
+
+
+def bidirectional_search(problem, verbose=False, debug=False, stats=None):
+    """bidirectional_search(problem, verbose, debug, stats) - Search
+    forward from problem.initial and backward from the goal boards until
+    the two searches meet, then join the halves into a single plan.  Moves
+    are reversible, so the backward search expands boards with the usual
+    moves and the plan undoes them.
+
+    When problem.h is 0 at the initial state (BreadthFirst) this is a
+    bidirectional breadth first search that expands whole layers of the
+    smaller side.  Otherwise it is the MM algorithm:  each side is ordered
+    by max(g + h, 2g), using problem.h forward and the Manhattan distance
+    to the initial board backward, and it stops once the best plan found is
+    no longer than the smallest priority on either side.  Both are optimal
+    for unit move costs and admissible heuristics.
+
+    stats, a searchstats.SearchStats, gets the counters of both sides
+    together.  The breadth first search reports probes in place of nodes,
+    and its frontier is the two current layers.
+
+    Returns the same (path, nodes_explored, elapsed_s) tuple as graph_search.
+    """
+    timer = Timer()
+    if stats is None:
+        stats = NullStats()
+    root = Node(problem, problem.initial)
+    if root.h == 0:
+        actions = _bidirectional_breadth_first(problem, debug, stats)
+    else:
+        actions = _bidirectional_mm(problem, root, debug, stats)
+    if actions is None:
+        return None
+    return (solution_path(problem, actions, verbose), stats.expansions,
+            timer.elapsed_s())
+
+
+def _inverse(action):
+    "_inverse(action) - Move that undoes action"
+    return [-action[0], -action[1]]
+
+
+def _join(forward, backward, meeting):
+    """_join(forward, backward, meeting) - Plan through a meeting state.
+    forward and backward map states to (previous state, action, depth),
+    where the action leads from the previous state to the state; the
+    chains end at entries whose previous state is None."""
+    actions = []
+    state = meeting
+    while forward[state][0] is not None:
+        (state, action, _) = forward[state]
+        actions.append(action)
+    actions.reverse()
+    state = meeting
+    while backward[state][0] is not None:
+        (state, action, _) = backward[state]
+        actions.append(_inverse(action))
+    return actions
+
+
+def _bidirectional_breadth_first(problem, debug, stats):
+    "Bidirectional breadth first search, returns the actions or None"
+    # state -> (previous state, action, depth) for each side
+    forward = {problem.initial.state_tuple(): (None, None, 0)}
+    backward = {}
+    for goal in problem.initial.goal_boards():
+        backward[goal.state_tuple()] = (None, None, 0)
+    if problem.initial.state_tuple() in backward:
+        return []
+    layers = [[problem.initial], problem.initial.goal_boards()]
+    seen = [forward, backward]
+    stats.frontier(len(layers[0]) + len(layers[1]))
+    while layers[0] and layers[1]:
+        # Grow the side with the smaller layer by one full layer
+        side = 0 if len(layers[0]) <= len(layers[1]) else 1
+        mine = seen[side]
+        other = seen[1 - side]
+        best = None
+        following = []
+        for board in layers[side]:
+            stats.expand(_Probe(board))
+            key = board.state_tuple()
+            depth = mine[key][2] + 1
+            for action in board.get_actions():
+                child = board.move(action)
+                stats.generate(_Probe(child))
+                childkey = child.state_tuple()
+                if childkey in mine:
+                    stats.duplicate(_Probe(child))
+                    continue
+                mine[childkey] = (key, action, depth)
+                following.append(child)
+                if childkey in other:
+                    length = depth + other[childkey][2]
+                    if best is None or length < best[0]:
+                        best = (length, childkey)
+        if debug:
+            print(f'{"forward" if side == 0 else "backward"} layer of '
+                  f'{len(following)} boards')
+        if best is not None:
+            return _join(forward, backward, best[1])
+        layers[side] = following
+        stats.frontier(len(layers[0]) + len(layers[1]))
+    return None
+
+
+def _bidirectional_mm(problem, root, debug, stats):
+    "MM bidirectional heuristic search, returns the actions or None"
+    # Backward heuristic:  Manhattan distance to the initial board
+    boardsize = problem.initial.boardsize
+    target = {}
+    for position, tile in enumerate(problem.initial.state_tuple()):
+        if tile is not None:
+            target[tile] = divmod(position, boardsize)
+
+    def to_initial(searchnode):
+        value = 0
+        for position, tile in enumerate(searchnode.state.state_tuple()):
+            if tile is not None:
+                (row, col) = divmod(position, boardsize)
+                (trow, tcol) = target[tile]
+                value += abs(row - trow) + abs(col - tcol)
+        return value
+
+    reverse = Problem(problem.initial, g=problem.g, h=to_initial)
+    problems = [problem, reverse]
+    opened = [PriorityQueue(f=lambda n: max(n.f, 2 * n.g)) for _ in problems]
+    # state -> best node found so far, open or closed, for each side
+    best = [{}, {}]
+    opened[0].append(root)
+    best[0][root.state.state_tuple()] = root
+    for goal in problem.initial.goal_boards():
+        node = Node(reverse, goal)
+        opened[1].append(node)
+        best[1][goal.state_tuple()] = node
+
+    meeting = None
+    cost = None  # cost of the best plan found, U in the MM paper
+    if root.state.state_tuple() in best[1]:
+        return []
+    stats.frontier(len(opened[0]) + len(opened[1]))
+    while opened[0] and opened[1]:
+        priorities = [max(q.peek().f, 2 * q.peek().g) for q in opened]
+        if cost is not None and cost <= min(priorities):
+            break
+        side = 0 if priorities[0] <= priorities[1] else 1
+        node = opened[side].pop()
+        stats.expand(node)
+        if debug:
+            print(f'{"forward" if side == 0 else "backward"} expanding', node)
+        for child in node.expand(problems[side]):
+            stats.generate(child)
+            key = child.state.state_tuple()
+            previous = best[side].get(key)
+            if previous is not None:
+                if previous.g <= child.g:
+                    stats.duplicate(child)
+                    continue
+                # Better path, replaces an open entry or reopens
+                if previous in opened[side]:
+                    del opened[side][previous]
+                else:
+                    stats.reopen(child)
+            best[side][key] = child
+            opened[side].append(child)
+            match = best[1 - side].get(key)
+            if match is not None and (cost is None or
+                                      child.g + match.g < cost):
+                cost = child.g + match.g
+                meeting = key
+        stats.frontier(len(opened[0]) + len(opened[1]))
+
+    if meeting is None:
+        return None
+    # Convert best-node tables to the chains _join expects
+    chains = []
+    for side in (0, 1):
+        chain = {}
+        node = best[side][meeting]
+        while node is not None:
+            parent = node.parent
+            chain[node.state.state_tuple()] = (
+                parent.state.state_tuple() if parent else None,
+                node.action, node.depth)
+            node = parent
+        chains.append(chain)
+    return _join(chains[0], chains[1], meeting)
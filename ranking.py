@@ -0,0 +1,95 @@
+"""
+ranking - Perfect hashing of N-puzzle states
+
+Maps every board reachable from the (blank last) goal to a distinct
+integer in [0, (N+1)!/2) and back, so that tables of per-state data can
+be flat arrays indexed by rank instead of dictionaries keyed by tuples.
+
+The rank is
+    blank position * N!/2 + lexicographic rank of the tiles // 2
+where the tiles are read in row-major order skipping the blank.  For a
+fixed blank position the reachable boards are exactly the tile orders
+of one inversion parity.  Lexicographic neighbors 2k and 2k+1 differ
+only by swapping the last two tiles, which flips the parity, so halving
+the lexicographic (Lehmer code) rank loses nothing.
+"""
+
+import math
+
+
+def state_count(boardsize):
+    "state_count(boardsize) - Number of boards reachable from the goal"
+    return math.factorial(boardsize * boardsize) // 2
+
+
+def tile_parity(blank, boardsize):
+    """tile_parity(blank, boardsize) - Inversion parity (0 even, 1 odd) of
+    the tiles of reachable boards with the blank at position blank.
+    See TileBoard.solvable."""
+    if boardsize % 2:
+        return 0
+    return (blank // boardsize + 1) % 2
+
+
+def rank_tiles(tiles):
+    """rank_tiles(tiles) - Rank of a row-major tile sequence with None
+    (or 0) for the blank.  The board must be reachable from the blank last
+    goal, otherwise it would share its rank with one that is, and
+    ValueError is raised.  Boards with several goals (see
+    TileBoard.goalset) can be in either half of the tile orders."""
+    count = len(tiles) - 1  # number of tiles
+    half = math.factorial(count) // 2
+    rank = 0
+    parity = 0  # sum of the Lehmer digits
+    seen = 0  # bit t set once tile t has been read
+    position = 0  # index among the tiles, blank skipped
+    for cell, tile in enumerate(tiles):
+        if not tile:
+            blank = cell
+            continue
+        if position < count - 1:
+            # Lehmer digit:  tiles after this one that are smaller
+            smaller = tile - 1 - bin(seen & ((1 << tile) - 1)).count("1")
+            parity += smaller
+            if position < count - 2:
+                rank = rank * (count - position) + smaller
+            seen |= 1 << tile
+        position += 1
+    if parity % 2 != tile_parity(blank, int(math.isqrt(count + 1))):
+        raise ValueError("Board is not reachable from the blank last goal")
+    # Digit radices N, N-1, ..., 3:  the last two positions are implied
+    return blank * half + rank
+
+
+def unrank_tiles(rank, boardsize):
+    "unrank_tiles(rank, boardsize) - Tile tuple (None for blank) of a rank"
+    count = boardsize * boardsize - 1
+    half = math.factorial(count) // 2
+    blank, rank = divmod(rank, half)
+    if not 0 <= blank <= count:
+        raise ValueError("Rank out of range")
+    digits = [0] * (count - 2)
+    for position in range(count - 3, -1, -1):
+        rank, digits[position] = divmod(rank, count - position)
+    available = list(range(1, count + 1))
+    tiles = [available.pop(digit) for digit in digits]
+    # Order the last two tiles to give the parity this blank requires
+    (low, high) = available
+    if sum(digits) % 2 == tile_parity(blank, boardsize):
+        tiles.extend((low, high))
+    else:
+        tiles.extend((high, low))
+    tiles.insert(blank, None)
+    return tuple(tiles)
+
+
+def rank(board):
+    "rank(board) - Rank of a TileBoard"
+    return rank_tiles(board.state_tuple())
+
+
+def unrank(rank, template):
+    """unrank(rank, template) - TileBoard with the given rank, sharing the
+    size and goals of the TileBoard template"""
+    tiles = unrank_tiles(rank, template.boardsize)
+    return template._derive(tiles, tiles.index(None))
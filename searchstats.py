@@ -0,0 +1,156 @@
+"""
+searchstats - Counters and phase timings collected during a search
+
+A SearchStats instance passed to graph_search(..., stats=stats) is
+updated as the search runs.  Searches run without one use a NullStats,
+which only counts expansions.  Its other methods do nothing, but the
+search still calls them, so an unobserved search is not entirely free of
+instrumentation:  it pays for a few empty calls per node.
+
+Counters:
+    expansions - nodes removed from the frontier and expanded
+    generations - children created by expansions
+    duplicates - children discarded because their state was already seen
+    reopenings - states whose entry was replaced by a cheaper path
+    peak_frontier - largest number of nodes waiting in the frontier
+
+Phase times (seconds, in times, only when timing is True):
+    expand - producing children, excluding heuristic evaluation
+    heuristic - problem.h calls
+    queue - frontier appends and pops
+    explored - explored set lookups and insertions
+
+An observer, if given, is called as observer(event, node, stats) for
+each event:  "expand", "generate", "duplicate" and "reopen".
+"""
+
+import time
+
+PHASES = ("expand", "heuristic", "queue", "explored")
+EVENTS = ("expand", "generate", "duplicate", "reopen")
+
+
+def _no_clock():
+    "Stand-in for time.perf_counter when phases are not timed"
+    return 0.0
+
+
+class SearchStats(object):
+    """
+    Counters, peak frontier size and per phase times of one search.
+    """
+
+    def __init__(self, observer=None, timing=True):
+        """SearchStats(observer, timing)
+        observer - optional callable observer(event, node, stats)
+        timing - measure per phase times.  Counting alone is cheaper and
+            leaves the elapsed time of the search closer to an
+            uninstrumented run.
+        """
+        self.observer = observer
+        self.timing = timing
+        self.clock = time.perf_counter if timing else _no_clock
+        self.reset()
+
+    def reset(self):
+        "reset() - Zero all counters and times"
+        self.expansions = 0
+        self.generations = 0
+        self.duplicates = 0
+        self.reopenings = 0
+        self.peak_frontier = 0
+        self.times = dict.fromkeys(PHASES, 0.0)
+
+    def expand(self, node):
+        "expand(node) - node is being expanded"
+        self.expansions += 1
+        if self.observer is not None:
+            self.observer("expand", node, self)
+
+    def generate(self, node):
+        "generate(node) - node was created by an expansion"
+        self.generations += 1
+        if self.observer is not None:
+            self.observer("generate", node, self)
+
+    def duplicate(self, node):
+        "duplicate(node) - node was discarded, its state was already seen"
+        self.duplicates += 1
+        if self.observer is not None:
+            self.observer("duplicate", node, self)
+
+    def reopen(self, node):
+        "reopen(node) - node replaced a costlier entry for its state"
+        self.reopenings += 1
+        if self.observer is not None:
+            self.observer("reopen", node, self)
+
+    def frontier(self, size):
+        "frontier(size) - The frontier now holds size nodes"
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def timed(self, phase, function):
+        """timed(phase, function) - Wrap function so that the time spent in
+        it is added to phase"""
+        clock = self.clock
+        times = self.times
+
+        def wrapper(*args):
+            start = clock()
+            try:
+                return function(*args)
+            finally:
+                times[phase] += clock() - start
+        return wrapper
+
+    def as_dict(self):
+        "as_dict() - Counters and times as a dictionary"
+        return {"expansions": self.expansions,
+                "generations": self.generations,
+                "duplicates": self.duplicates,
+                "reopenings": self.reopenings,
+                "peak_frontier": self.peak_frontier,
+                "times": dict(self.times)}
+
+    def __repr__(self):
+        counts = ("expansions {} generations {} duplicates {} reopenings {} "
+                  "peak frontier {}").format(
+                      self.expansions, self.generations, self.duplicates,
+                      self.reopenings, self.peak_frontier)
+        if not self.timing:
+            return counts
+        return counts + "\n" + "  ".join(
+            "{} {:.3f}s".format(phase, self.times[phase]) for phase in PHASES)
+
+
+class NullStats(object):
+    """
+    Stand-in for a SearchStats when a search is not observed.  Only
+    expansions are counted, as searches report them; other events are
+    ignored and no phase is timed.
+    """
+    timing = False
+    observer = None
+
+    def __init__(self):
+        "NullStats() - No expansions yet"
+        self.expansions = 0
+        self.clock = _no_clock
+        self.times = dict.fromkeys(PHASES, 0.0)
+
+    def expand(self, node):
+        "expand(node) - node is being expanded"
+        self.expansions += 1
+
+    def generate(self, node):
+        "generate(node) - Ignored"
+
+    def duplicate(self, node):
+        "duplicate(node) - Ignored"
+
+    def reopen(self, node):
+        "reopen(node) - Ignored"
+
+    def frontier(self, size):
+        "frontier(size) - Ignored"
@@ -1,106 +1,545 @@
-"""
-searchstrategies
-
-Module to provide implementations of g and h for various search strategies.
-In each case, the functions are class methods as we don't need an instance
-of the class.  
-
-If you are unfamiliar with Python class methods, Python uses a function
-decorator (indicated by an @ to indicate that the next method is a class
-method).  Example:
-
-class SomeClass:
-    @classmethod
-    def foobar(cls, arg1, arg2):
-        "foobar(arg1, arg2) - does ..."
-        
-        code... class variables are accessed as cls.var (if needed)
-        return computed value
-
-A caller would import SomeClass and then call, e.g. :  
-    SomeClass.foobar("hola","amigos")
-
-This module contains g and h functions for:
-BreadFirst - breadth first search
-DepthFirst - depth first search
-Manhattan - city block heuristic search.  To restrict the complexity of
-    this, you only need handle heuristics for puzzles with a single solution
-    where the blank is in the center, e.g.:
-        123
-        4 5
-        678
-    When multiple solutions are allowed, the heuristic becomes a little more
-    complex as the city block distance must be estimated to each possible solution
-    searchnode. 
-"""
-
-import math
-from basicsearch_lib02.searchrep import Node
-from basicsearch_lib02.tileboard import TileBoard
-
-class BreadthFirst:
-    "BreadthFirst - breadth first search"
-    k = 0
-    @classmethod
-    def g(cls, parentnode, action, childnode):
-        """"g - cost from initial searchnode to childnode
-        constrained such that the last edge of the search space
-        moves from parentnode to childnode via the specified action
-        """
-        return parentnode.depth + 1
-    
-    @classmethod
-    def h(cls, searchnode):
-        "h - heuristic value"
-        return 0
-
-
-class DepthFirst:
-    "BreadthFirst - breadth first search"
-    @classmethod
-    def g(cls, parentnode, action, childnode):
-        k = 0
-        """"g - cost from initial searchnode to childnode
-        constrained such that the last edge of the search space
-        moves from parentnode to childnode via the specified action
-        """
-        return 0
-    
-    @classmethod
-    def h(cls, searchnode):
-        "h - heuristic value"
-        return searchnode.depth * -1
-
-class Manhattan:
-    "BreadthFirst - breadth first search"
-    @classmethod
-    def g(cls, parentnode, action, childnode):
-        """"g - cost from initial searchnode to childnode
-        constrained such that the last edge of the search space
-        moves from parentnode to childnode via the specified action
-        """
-        return parentnode.depth + 1
-    
-    @classmethod
-    def h(cls, searchnode):
-        "h - heuristic value"
-        value = 0
-        #These 2 for loops are looping through each row and column to find the displacement of the board.
-        for row in range(searchnode.state.boardsize):
-            for col in range(searchnode.state.boardsize):
-                #If the current placement on the board has a value and isn't none, run the following code.
-                if searchnode.state.board[row][col] is not None:
-                    
-                    current = searchnode.state.board[row][col]
-                    currentValue = current - 1
-                    
-                    expectedColumn = currentValue % searchnode.state.boardsize
-                    expectedRow = currentValue // searchnode.state.boardsize
-
-                    displacementColumn = abs(col - expectedColumn)
-                    displacementRow = abs(row - expectedRow)
-
-                    #Add both displacements from the Column and Row to value to get h.
-                    value = value + displacementColumn + displacementRow
-        #return the value
-        return value
\ No newline at end of file
+"""
+searchstrategies
+
+Module to provide implementations of g and h for various search strategies.
+In each case, the functions are class methods as we don't need an instance
+of the class.  
+
+If you are unfamiliar with Python class methods, Python uses a function
+decorator (indicated by an @ to indicate that the next method is a class
+method).  Example:
+
+class SomeClass:
+    @classmethod
+    def foobar(cls, arg1, arg2):
+        "foobar(arg1, arg2) - does ..."
+        
+        code... class variables are accessed as cls.var (if needed)
+        return computed value
+
+A caller would import SomeClass and then call, e.g. :  
+    SomeClass.foobar("hola","amigos")
+
+This module contains g and h functions for:
+BreadFirst - breadth first search
+DepthFirst - depth first search
+PatternDatabase - additive disjoint pattern database heuristic search
+    (see patterndb)
+LinearConflict - Manhattan distance plus linear conflicts
+NearestGoalManhattan - city block distance to the closest of several goals
+WalkingDistance - Takahashi's walking distance
+Manhattan - city block heuristic search.  To restrict the complexity of
+    this, you only need handle heuristics for puzzles with a single solution
+    where the blank is in the center, e.g.:
+        123
+        4 5
+        678
+    When multiple solutions are allowed, the heuristic becomes a little more
+    complex as the city block distance must be estimated to each possible solution
+    searchnode. 
+"""
+
+import math
+from bisect import bisect_left
+from basicsearch_lib02.searchrep import Node
+from basicsearch_lib02.tileboard import (TileBoard, parity_class)
+from patterndb import AdditivePatternDatabase
+import vectorized
+
+
+def single_goal(state, strategy):
+    """single_goal(state, strategy) - Raise ValueError if state has several
+    goals, for heuristics whose tables assume the blank ends last"""
+    if len(state.goals) > 1:
+        raise ValueError("%s supports boards with a single goal only, "
+                         "use Manhattan for several goals" % strategy)
+
+
+class BreadthFirst:
+    "BreadthFirst - breadth first search"
+    # h gives a board and its mirror image (see symmetry) the same value
+    mirror_symmetric = True
+    # h never overestimates, so graph_search and ida_search plans are optimal
+    admissible = True
+    k = 0
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return parentnode.depth + 1
+    
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        return 0
+
+
+class DepthFirst:
+    "BreadthFirst - breadth first search"
+    # h gives a board and its mirror image (see symmetry) the same value
+    mirror_symmetric = True
+    # h is negative, plans are not optimal
+    admissible = False
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        k = 0
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return 0
+    
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        return searchnode.depth * -1
+
+class Manhattan:
+    """Manhattan - city block heuristic search
+
+    The distance of every tile from every board position is precomputed
+    once per board size.  A move displaces exactly one tile, so when a
+    node has a parent, its h is the parent's h adjusted by the change
+    in distance of the tile that slid into the parent's blank.
+    """
+    # h gives a board and its mirror image (see symmetry) the same value
+    mirror_symmetric = True
+    # h never overestimates, so graph_search and ida_search plans are optimal
+    admissible = True
+    # boardsize -> table[tile][position] of city block distances
+    tables = {}
+
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return parentnode.depth + 1
+
+    @classmethod
+    def distance_table(cls, boardsize):
+        """distance_table(boardsize) - table[tile][position] distance of tile
+        from its goal position when it is at position (row major index).
+        Row 0 is for the blank and is all zeros."""
+        try:
+            return cls.tables[boardsize]
+        except KeyError:
+            table = [(0,) * (boardsize * boardsize)]
+            for tile in range(1, boardsize * boardsize):
+                expectedRow, expectedColumn = divmod(tile - 1, boardsize)
+                table.append(tuple(
+                    abs(row - expectedRow) + abs(col - expectedColumn)
+                    for row in range(boardsize) for col in range(boardsize)))
+            cls.tables[boardsize] = table
+            return table
+
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        state = searchnode.state
+        if len(state.goals) > 1:
+            # The blank may end anywhere, the tables assume it ends last
+            return NearestGoalManhattan.h(searchnode)
+        table = cls.distance_table(state.boardsize)
+        parent = searchnode.parent
+        if parent is not None:
+            # Incremental:  the tile now in the parent's blank position
+            # came from where the blank is now.
+            [delta_r, delta_c] = searchnode.action
+            previous = state.blank - (delta_r * state.boardsize + delta_c)
+            distances = table[state.tiles[previous]]
+            return parent.h + distances[previous] - distances[state.blank]
+
+        return cls.evaluate(state)
+
+    @classmethod
+    def evaluate(cls, state):
+        "evaluate(state) - heuristic value of a state, computed in full"
+        table = cls.distance_table(state.boardsize)
+        value = 0
+        #This loop goes through each position of the flattened board and adds the displacement of its tile.
+        for position, current in enumerate(state.tiles):
+            #If the current placement on the board has a value and isn't none, add its distance.
+            if current is not None:
+                value = value + table[current][position]
+        #return the value
+        return value
+
+    @classmethod
+    def h_batch(cls, states):
+        "h_batch(states) - heuristic values of a list of states"
+        if states and len(states[0].goals) > 1:
+            return [min(NearestGoalManhattan.distances(state)[1])
+                    for state in states]
+        if not vectorized.available or not states:
+            return [cls.evaluate(state) for state in states]
+        tiles = vectorized.stack(states)
+        return vectorized.manhattan(tiles, states[0].boardsize).tolist()
+
+
+class NearestGoalManhattan:
+    """NearestGoalManhattan - city block distance to the nearest goal
+
+    For boards with several goals, e.g. TileBoard(multiple_solutions=True)
+    where the blank may end in any position, h is the smallest Manhattan
+    distance to any goal the board can reach.  Goals of the other parity
+    class (see tileboard.parity_class) are never reached and are ignored.
+
+    A table[tile][position] of distances is precomputed for each goal.  A
+    node keeps its distance to every goal in hcache, so a child adjusts
+    each of them by the change for the one tile that moved.
+
+    LinearConflict, WalkingDistance and PatternDatabase assume the single
+    blank last goal and raise ValueError for boards with several goals.
+    """
+    # h never overestimates, so graph_search and ida_search plans are optimal
+    admissible = True
+    # goals tuple -> list of table[tile][position], one per goal
+    tables = {}
+
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return parentnode.depth + 1
+
+    @classmethod
+    def goal_tables(cls, goals, boardsize):
+        """goal_tables(goals, boardsize) - table[tile][position] distance of
+        tile from its position in each goal.  Row 0 is for the blank."""
+        goals = tuple(goals)
+        try:
+            return cls.tables[goals]
+        except KeyError:
+            pass
+        tables = []
+        for goal in goals:
+            table = [(0,) * len(goal)] * len(goal)
+            for target, tile in enumerate(goal):
+                if tile is not None:
+                    (goalrow, goalcol) = divmod(target, boardsize)
+                    table[tile] = tuple(
+                        abs(row - goalrow) + abs(col - goalcol)
+                        for row in range(boardsize) for col in range(boardsize))
+            tables.append(table)
+        cls.tables[goals] = tables
+        return tables
+
+    @classmethod
+    def distances(cls, state):
+        """distances(state) - (tables, distances), the tables of the goals
+        state can reach and its Manhattan distance to each of them"""
+        boardsize = state.boardsize
+        parity = parity_class(state.tiles, boardsize)
+        tables = [table for (goal, table) in
+                  zip(state.goals, cls.goal_tables(state.goals, boardsize))
+                  if parity_class(goal, boardsize) == parity]
+        distances = []
+        for table in tables:
+            value = 0
+            for position, tile in enumerate(state.tiles):
+                if tile is not None:
+                    value += table[tile][position]
+            distances.append(value)
+        return (tables, distances)
+
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        state = searchnode.state
+        parent = searchnode.parent
+        if parent is not None and parent.hcache is not None:
+            # Incremental:  the tile now in the parent's blank position
+            # came from where the blank is now.
+            (tables, distances) = parent.hcache
+            [delta_r, delta_c] = searchnode.action
+            previous = state.blank - (delta_r * state.boardsize + delta_c)
+            tile = state.tiles[previous]
+            blank = state.blank
+            distances = [distance + table[tile][previous] - table[tile][blank]
+                         for (distance, table) in zip(distances, tables)]
+        else:
+            (tables, distances) = cls.distances(state)
+        searchnode.hcache = (tables, distances)
+        return min(distances)
+
+
+
+class LinearConflict:
+    """LinearConflict - Manhattan distance plus linear conflicts
+
+    Two tiles in the same row (column) whose goal positions are also in
+    that row (column) but in the opposite order conflict:  one of them
+    must leave the line and come back, costing two moves beyond their
+    Manhattan distances.  For each line, the number of tiles that must
+    leave is the count of tiles belonging to it less the longest run of
+    them already in goal order.
+
+    A move only changes the line containing both cells and the two lines
+    that the moved tile leaves and enters, so children are evaluated from
+    the parent's h by rescoring those three lines.
+    """
+    # h gives a board and its mirror image (see symmetry) the same value
+    mirror_symmetric = True
+    # h never overestimates, so graph_search and ida_search plans are optimal
+    admissible = True
+
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return parentnode.depth + 1
+
+    @classmethod
+    def line_conflicts(cls, tiles, boardsize, line, horizontal, swap=None):
+        """line_conflicts(tiles, boardsize, line, horizontal, swap)
+        Number of tiles that must leave a row (horizontal) or column for
+        the remaining tiles of that line to be in goal order.
+        swap is an optional pair of positions whose tiles are exchanged
+        before the line is read, used to look at the parent's board.
+        """
+        if horizontal:
+            cells = range(line * boardsize, (line + 1) * boardsize)
+        else:
+            cells = range(line, boardsize * boardsize, boardsize)
+        # Longest increasing run of goal coordinates (patience sorting)
+        count = 0
+        piles = []
+        for position in cells:
+            if swap is not None:
+                if position == swap[0]:
+                    position = swap[1]
+                elif position == swap[1]:
+                    position = swap[0]
+            tile = tiles[position]
+            if tile is None:
+                continue
+            (goalrow, goalcol) = divmod(tile - 1, boardsize)
+            if horizontal:
+                if goalrow != line:
+                    continue
+                coordinate = goalcol
+            else:
+                if goalcol != line:
+                    continue
+                coordinate = goalrow
+            count += 1
+            pile = bisect_left(piles, coordinate)
+            if pile == len(piles):
+                piles.append(coordinate)
+            else:
+                piles[pile] = coordinate
+        return count - len(piles)
+
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        state = searchnode.state
+        single_goal(state, "LinearConflict")
+        boardsize = state.boardsize
+        tiles = state.tiles
+        parent = searchnode.parent
+        if parent is not None:
+            [delta_r, delta_c] = searchnode.action
+            previous = state.blank - (delta_r * boardsize + delta_c)
+            distances = Manhattan.distance_table(boardsize)[tiles[previous]]
+            # Lines touched by the move:  the one holding both cells and
+            # the two the tile crossed between.
+            (oldrow, oldcol) = divmod(state.blank, boardsize)
+            (newrow, newcol) = divmod(previous, boardsize)
+            if delta_r:
+                lines = ((oldcol, False), (oldrow, True), (newrow, True))
+            else:
+                lines = ((oldrow, True), (oldcol, False), (newcol, False))
+            swap = (previous, state.blank)
+            change = 0
+            for (line, horizontal) in lines:
+                change += cls.line_conflicts(
+                    tiles, boardsize, line, horizontal) - \
+                    cls.line_conflicts(
+                        tiles, boardsize, line, horizontal, swap)
+            return parent.h + distances[previous] - \
+                distances[state.blank] + 2 * change
+
+        return cls.evaluate(state)
+
+    @classmethod
+    def evaluate(cls, state):
+        "evaluate(state) - heuristic value of a state, computed in full"
+        value = Manhattan.evaluate(state)
+        for line in range(state.boardsize):
+            value += 2 * (
+                cls.line_conflicts(state.tiles, state.boardsize, line, True) +
+                cls.line_conflicts(state.tiles, state.boardsize, line, False))
+        return value
+
+    @classmethod
+    def h_batch(cls, states):
+        "h_batch(states) - heuristic values of a list of states"
+        if states:
+            single_goal(states[0], "LinearConflict")
+        if not vectorized.available or not states:
+            return [cls.evaluate(state) for state in states]
+        tiles = vectorized.stack(states)
+        boardsize = states[0].boardsize
+        return (vectorized.manhattan(tiles, boardsize) +
+                2 * vectorized.linear_conflicts(tiles, boardsize)).tolist()
+
+
+class WalkingDistance:
+    """WalkingDistance - Takahashi's walking distance
+
+    Vertically, a board is summarized by how many tiles of each goal row
+    sit in each row, together with the row of the blank.  The walking
+    distance is the fewest moves that turn this summary into the goal's
+    when the blank may swap with any tile of an adjacent row.  The same
+    table serves columns by transposing the board.  The vertical and
+    horizontal distances are summed; every move changes only one of them
+    by at most one, so the sum is admissible.
+
+    Tables are built by breadth-first search from the goal the first time
+    a board size is seen.  The 4x4 table has 24,964 entries and builds in
+    well under a second; the 5x5 table runs to tens of millions of entries
+    and takes gigabytes and a long time to build.
+    """
+    # h gives a board and its mirror image (see symmetry) the same value
+    mirror_symmetric = True
+    # h never overestimates, so graph_search and ida_search plans are optimal
+    admissible = True
+    # boardsize -> {packed summary: walking distance}
+    tables = {}
+
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return parentnode.depth + 1
+
+    @classmethod
+    def pack(cls, counts, blankrow, boardsize):
+        """pack(counts, blankrow, boardsize) - Key for a summary where
+        counts[row * boardsize + goalrow] is the number of tiles in row
+        that belong in goalrow"""
+        key = blankrow
+        for count in counts:
+            key = key * (boardsize + 1) + count
+        return key
+
+    @classmethod
+    def unpack(cls, key, boardsize):
+        "unpack(key, boardsize) - (counts, blankrow) for a packed summary"
+        counts = [0] * (boardsize * boardsize)
+        for idx in range(len(counts) - 1, -1, -1):
+            key, counts[idx] = divmod(key, boardsize + 1)
+        return counts, key
+
+    @classmethod
+    def table(cls, boardsize):
+        "table(boardsize) - Walking distance table, built on first use"
+        try:
+            return cls.tables[boardsize]
+        except KeyError:
+            pass
+        # Goal: every row holds its own tiles, the blank is in the last row
+        counts = [0] * (boardsize * boardsize)
+        for row in range(boardsize):
+            counts[row * boardsize + row] = boardsize
+        counts[-1] -= 1
+        layer = [cls.pack(counts, boardsize - 1, boardsize)]
+        table = {layer[0]: 0}
+        depth = 0
+        while layer:
+            depth += 1
+            following = []
+            for key in layer:
+                (counts, blankrow) = cls.unpack(key, boardsize)
+                for row in (blankrow - 1, blankrow + 1):
+                    if not 0 <= row < boardsize:
+                        continue
+                    # Any tile of row may slide into the blank's row
+                    for goalrow in range(boardsize):
+                        if counts[row * boardsize + goalrow] == 0:
+                            continue
+                        moved = list(counts)
+                        moved[row * boardsize + goalrow] -= 1
+                        moved[blankrow * boardsize + goalrow] += 1
+                        key = cls.pack(moved, row, boardsize)
+                        if key not in table:
+                            table[key] = depth
+                            following.append(key)
+            layer = following
+        cls.tables[boardsize] = table
+        return table
+
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        state = searchnode.state
+        single_goal(state, "WalkingDistance")
+        boardsize = state.boardsize
+        table = cls.table(boardsize)
+        vertical = [0] * (boardsize * boardsize)
+        horizontal = [0] * (boardsize * boardsize)
+        for position, tile in enumerate(state.tiles):
+            if tile is not None:
+                (row, col) = divmod(position, boardsize)
+                (goalrow, goalcol) = divmod(tile - 1, boardsize)
+                vertical[row * boardsize + goalrow] += 1
+                horizontal[col * boardsize + goalcol] += 1
+        (blankrow, blankcol) = divmod(state.blank, boardsize)
+        return table[cls.pack(vertical, blankrow, boardsize)] + \
+            table[cls.pack(horizontal, blankcol, boardsize)]
+
+
+class PatternDatabase:
+    """PatternDatabase - additive disjoint pattern database heuristic search
+
+    One patterndb.AdditivePatternDatabase is used per board size.
+    Install them before searching, e.g.
+        PatternDatabase.load("fifteen.npdb")
+    """
+    # h never overestimates, so graph_search and ida_search plans are optimal
+    admissible = True
+    # boardsize -> AdditivePatternDatabase
+    databases = {}
+
+    @classmethod
+    def use(cls, database):
+        "use(database) - Use an AdditivePatternDatabase for its board size"
+        cls.databases[database.boardsize] = database
+
+    @classmethod
+    def load(cls, filename):
+        "load(filename) - Read a saved pattern database and use it"
+        database = AdditivePatternDatabase.load(filename)
+        cls.use(database)
+        return database
+
+    @classmethod
+    def g(cls, parentnode, action, childnode):
+        """"g - cost from initial searchnode to childnode
+        constrained such that the last edge of the search space
+        moves from parentnode to childnode via the specified action
+        """
+        return parentnode.depth + 1
+
+    @classmethod
+    def h(cls, searchnode):
+        "h - heuristic value"
+        state = searchnode.state
+        single_goal(state, "PatternDatabase")
+        try:
+            database = cls.databases[state.boardsize]
+        except KeyError:
+            raise ValueError("No pattern database loaded for %dx%d boards" % (
+                state.boardsize, state.boardsize))
+        return database.h(state.tiles)
@@ -0,0 +1,203 @@
+"""
+solutioncache - Cache of solved N-puzzle instances
+
+A SolutionCache sits in front of a search function and remembers the
+plan found for every initial board.  Entries are keyed by the packed
+initial state (see tileboard.pack).  Lookups try a bounded in-memory
+LRU layer first and then an optional sqlite database file, so plans
+survive restarts and can be shared between processes.
+
+For the usual blank last goal, a board and its mirror image along the
+main diagonal (see symmetry) share one entry:  the key is the smaller
+of their packed states, and a stored plan is mirrored move by move when
+it is returned for the other board.
+
+Each plan is stored with a flag telling whether it is known to be
+optimal.  A plan from a search that need not find optimal plans, e.g.
+DepthFirst, beam_search or ARA* out of time, is only returned to callers
+that do not ask for an optimal one, and it is replaced once an optimal
+plan for the board is found.  solve() infers the flag for graph_search
+and ida_search with an admissible heuristic (see the admissible
+attribute of the strategies in searchstrategies).
+
+    cache = SolutionCache("plans.sqlite")
+    path, nodes_explored, elapsed_s = cache.solve(problem)
+"""
+
+import sqlite3
+from collections import OrderedDict
+
+from basicsearch_lib02.searchrep import MOVES, MOVE_CODES
+from basicsearch_lib02.tileboard import pack
+from basicsearch_lib02.timer import Timer
+from problemsearch import (graph_search, ida_search, solution_path)
+import symmetry
+
+# Letters plans are stored as, by move code (up, down, left, right)
+LETTERS = "UDLR"
+
+# Searches whose plans are optimal when problem.h is admissible
+OPTIMAL_SEARCHES = (graph_search, ida_search)
+
+
+def encode_plan(actions):
+    "encode_plan(actions) - String of move letters for a list of actions"
+    return "".join(LETTERS[MOVE_CODES[tuple(action)]] for action in actions)
+
+
+def decode_plan(plan):
+    "decode_plan(plan) - List of actions for a string of move letters"
+    return [list(MOVES[LETTERS.index(letter)]) for letter in plan]
+
+
+class SolutionCache(object):
+    """
+    Plans for N-puzzle boards, in a least recently used memory layer
+    backed by an optional sqlite file.
+    """
+
+    def __init__(self, filename=None, capacity=4096):
+        """SolutionCache(filename, capacity)
+        filename - sqlite database file, created if needed.  If None,
+            plans are only kept in memory.
+        capacity - most plans kept in memory, the least recently used
+            plan is evicted first
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.memory = OrderedDict()  # key -> (plan string, optimal)
+        self.hits = 0
+        self.misses = 0
+        self.database = None
+        if filename is not None:
+            self.database = sqlite3.connect(filename)
+            self.database.execute(
+                "CREATE TABLE IF NOT EXISTS solutions "
+                "(state TEXT PRIMARY KEY, plan TEXT NOT NULL, "
+                "optimal INTEGER NOT NULL DEFAULT 0)")
+            columns = [row[1] for row in self.database.execute(
+                "PRAGMA table_info(solutions)")]
+            if "optimal" not in columns:
+                # Files written before plans were flagged, whose plans
+                # may not be optimal
+                self.database.execute(
+                    "ALTER TABLE solutions ADD COLUMN "
+                    "optimal INTEGER NOT NULL DEFAULT 0")
+            self.database.commit()
+
+    def key(self, board):
+        """key(board) - (cache key, mirrored) for a TileBoard, where mirrored
+        is True if the entry holds the plan of its mirror image"""
+        boardsize = board.boardsize
+        if symmetry.blank_last(board):
+            (packed, mirrored) = symmetry.canonical(board.tiles, boardsize)
+            return ("%d:%x" % (boardsize, packed), mirrored)
+        # Other goal sets get their own entries, without mirroring
+        goals = ",".join("%x" % goal for goal in sorted(board.packed_goals()))
+        return ("%d:%x:%s" % (boardsize, pack(board.tiles, boardsize), goals),
+                False)
+
+    def _remember(self, key, plan, optimal):
+        "_remember(key, plan, optimal) - Put a plan in the memory layer"
+        self.memory[key] = (plan, optimal)
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def _lookup(self, key):
+        "_lookup(key) - (plan string, optimal) for a key, or None"
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+        elif self.database is not None:
+            row = self.database.execute(
+                "SELECT plan, optimal FROM solutions WHERE state = ?",
+                (key,)).fetchone()
+            if row is not None:
+                entry = (row[0], bool(row[1]))
+                self._remember(key, *entry)
+        return entry
+
+    def get(self, board, optimal=False):
+        """get(board, optimal) - List of actions solving board, or None if
+        the board is not in the cache.  If optimal is True, only a plan
+        known to be optimal is returned."""
+        (key, mirrored) = self.key(board)
+        entry = self._lookup(key)
+        plan = None
+        if entry is not None and (entry[1] or not optimal):
+            plan = entry[0]
+        if plan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        actions = decode_plan(plan)
+        if mirrored:
+            actions = [symmetry.mirror_action(action) for action in actions]
+        return actions
+
+    def put(self, board, actions, optimal=False):
+        """put(board, actions, optimal) - Store the list of actions that
+        solves board, optimal telling whether it is an optimal plan.  An
+        optimal plan already stored is not replaced by one that is not."""
+        (key, mirrored) = self.key(board)
+        entry = self._lookup(key)
+        if entry is not None and entry[1] and not optimal:
+            return
+        if mirrored:
+            actions = [symmetry.mirror_action(action) for action in actions]
+        plan = encode_plan(actions)
+        self._remember(key, plan, optimal)
+        if self.database is not None:
+            self.database.execute(
+                "INSERT OR REPLACE INTO solutions (state, plan, optimal) "
+                "VALUES (?, ?, ?)", (key, plan, int(optimal)))
+            self.database.commit()
+
+    def solve(self, problem, search=graph_search, optimal=None,
+              verbose=False):
+        """solve(problem, search, optimal, verbose) - Plan for problem.initial
+        from the cache, or from search(problem) which is then cached.
+        Returns the same (path, nodes_explored, elapsed_s) tuple as
+        graph_search; a cached plan has no nodes explored.
+
+        optimal - whether search returns optimal plans.  If None, True for
+            graph_search and ida_search when problem.h is admissible.  An
+            optimal search is only answered from the cache with an optimal
+            plan, any other with whatever plan is cached.
+        """
+        if optimal is None:
+            strategy = getattr(problem.h, "__self__", None)
+            optimal = (search in OPTIMAL_SEARCHES and
+                       getattr(strategy, "admissible", False))
+        timer = Timer()
+        actions = self.get(problem.initial, optimal)
+        if actions is not None:
+            return (solution_path(problem, actions, verbose), 0,
+                    timer.elapsed_s())
+        result = search(problem)
+        if result is None:
+            return None
+        (path, explored) = result[:2]
+        actions = path[-1].solution()
+        self.put(problem.initial, actions, optimal)
+        if verbose:
+            solution_path(problem, actions, verbose)
+        return (path, explored, timer.elapsed_s())
+
+    def __len__(self):
+        "len() - Number of plans in memory"
+        return len(self.memory)
+
+    def close(self):
+        "close() - Close the database file"
+        if self.database is not None:
+            self.database.close()
+            self.database = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
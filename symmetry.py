@@ -0,0 +1,126 @@
+"""
+symmetry - Mirror image of N-puzzle boards along the main diagonal
+
+Transposing a board (the tile in row r, column c moves to row c, column
+r) and renaming every tile after the transposed goal cell of its old
+name maps the blank last goal onto itself, and maps a move [dr, dc] to
+the move [dc, dr].  A board and its mirror image are therefore the same
+distance from the goal, and a plan for one, with each move mirrored, is
+a plan for the other.  This only holds for the single, blank last goal.
+"""
+
+from basicsearch_lib02.tileboard import (pack, tile_bits)
+
+# boardsize -> (cell permutation, tile renaming) for mirror_tiles
+_mirrors = {}
+# boardsize -> (shift pairs, tile renaming, mask) for packed states
+_packed_mirrors = {}
+
+
+def _mirror(boardsize):
+    "_mirror(boardsize) - Transposed cell of each cell and new name of tiles"
+    try:
+        return _mirrors[boardsize]
+    except KeyError:
+        pass
+    cells = [(cell % boardsize) * boardsize + cell // boardsize
+             for cell in range(boardsize * boardsize)]
+    # Tile t belongs in cell t-1, its mirror image is named after the
+    # transposed cell
+    names = [None] + [cells[tile - 1] + 1
+                      for tile in range(1, boardsize * boardsize)]
+    _mirrors[boardsize] = (cells, names)
+    return (cells, names)
+
+
+def _packed_mirror(boardsize):
+    """_packed_mirror(boardsize) - (pairs, names, mask) where pairs holds
+    the bit offsets of each cell and its transposed cell in a packed
+    state, last cell first, and names renames tiles with the blank 0"""
+    try:
+        return _packed_mirrors[boardsize]
+    except KeyError:
+        pass
+    (cells, names) = _mirror(boardsize)
+    bits = tile_bits(boardsize)
+    pairs = [(cell * bits, cells[cell] * bits)
+             for cell in reversed(range(boardsize * boardsize))]
+    result = (pairs, [0] + names[1:], (1 << bits) - 1)
+    _packed_mirrors[boardsize] = result
+    return result
+
+
+def blank_last(board):
+    "blank_last(board) - Does a TileBoard have only the blank last goal?"
+    return len(board.goals) == 1 and board.goals[0][-1] is None
+
+
+def mirror_tiles(tiles, boardsize):
+    """mirror_tiles(tiles, boardsize) - Row-major tile tuple (None for the
+    blank) of the mirror image of a board"""
+    (cells, names) = _mirror(boardsize)
+    mirrored = [None] * len(tiles)
+    for cell, tile in enumerate(tiles):
+        mirrored[cells[cell]] = names[tile] if tile else None
+    return tuple(mirrored)
+
+
+def mirror_action(action):
+    "mirror_action(action) - Move [dc, dr] that mirrors the move [dr, dc]"
+    [delta_r, delta_c] = action
+    return [delta_c, delta_r]
+
+
+def canonical(tiles, boardsize):
+    """canonical(tiles, boardsize) - (key, mirrored) where key is the
+    smaller packed state (see tileboard.pack) of a board and its mirror
+    image, and mirrored is True if that is the mirror image's"""
+    own = pack(tiles, boardsize)
+    other = pack(mirror_tiles(tiles, boardsize), boardsize)
+    if other < own:
+        return (other, True)
+    return (own, False)
+
+
+def mirror_packed(packed, boardsize):
+    "mirror_packed(packed, boardsize) - Packed state of the mirror image"
+    (pairs, names, mask) = _packed_mirror(boardsize)
+    mirrored = 0
+    for (shift, transposed) in pairs:
+        mirrored |= names[(packed >> transposed) & mask] << shift
+    return mirrored
+
+
+def canonical_packed(packed, boardsize):
+    """canonical_packed(packed, boardsize) - The smaller of a packed state
+    and that of its mirror image, compared from the most significant cell
+    down as in canonical_tiles"""
+    (pairs, names, mask) = _packed_mirror(boardsize)
+    for (shift, transposed) in pairs:
+        own = (packed >> shift) & mask
+        other = names[(packed >> transposed) & mask]
+        if own != other:
+            if other < own:
+                return mirror_packed(packed, boardsize)
+            break
+    return packed
+
+
+def canonical_tiles(tiles, boardsize):
+    """canonical_tiles(tiles, boardsize) - Tile tuple of whichever of a
+    board and its mirror image canonical() picks.  Use it as the state of
+    a board where a board and its mirror image are to be the same.
+
+    The last cell is the most significant in a packed state, so the two
+    are compared cell by cell from the last one, which usually settles it
+    within a cell or two, and the mirror image is only built if it wins."""
+    (cells, names) = _mirror(boardsize)
+    for cell in range(len(tiles) - 1, -1, -1):
+        own = tiles[cell] or 0
+        tile = tiles[cells[cell]]
+        other = names[tile] if tile else 0
+        if own != other:
+            if other < own:
+                return mirror_tiles(tiles, boardsize)
+            break
+    return tuple(tiles)
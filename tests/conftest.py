@@ -0,0 +1,62 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import distancetable  # noqa: E402
+from npuzzle import NPuzzle  # noqa: E402
+from patterndb import AdditivePatternDatabase  # noqa: E402
+from searchstrategies import Manhattan  # noqa: E402
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, None)
+
+
+@pytest.fixture(scope="session")
+def distances():
+    "Exact distance of every 8-puzzle state, indexed by ranking.rank_tiles"
+    return distancetable.build()
+
+
+@pytest.fixture(scope="session")
+def database():
+    "Additive pattern database for the 8-puzzle"
+    return AdditivePatternDatabase.build(3)
+
+
+def board(tiles, **kwargs):
+    "TileBoard for a row-major tile sequence with None for the blank"
+    return NPuzzle(len(tiles) - 1, force_state=list(tiles), **kwargs).initial
+
+
+def make_problem(tiles, strategy=Manhattan, **kwargs):
+    "NPuzzle starting from tiles and searched with a strategy class"
+    problem = NPuzzle(len(tiles) - 1, force_state=list(tiles), **kwargs)
+    problem.g = strategy.g
+    problem.h = strategy.h
+    return problem
+
+
+def neighbors(tiles, boardsize):
+    "Tile tuples one move away"
+    blank = tiles.index(None)
+    (row, col) = divmod(blank, boardsize)
+    for (r, c) in ((row - 1, col), (row + 1, col),
+                   (row, col - 1), (row, col + 1)):
+        if 0 <= r < boardsize and 0 <= c < boardsize:
+            child = list(tiles)
+            child[blank] = child[r * boardsize + c]
+            child[r * boardsize + c] = None
+            yield tuple(child)
+
+
+def is_plan(path):
+    "Is a path of search nodes a sequence of moves ending at a goal?"
+    for (node, following) in zip(path, path[1:]):
+        moves = [node.state.move(action).state_tuple()
+                 for action in node.state.get_actions()]
+        if following.state.state_tuple() not in moves:
+            return False
+    return path[-1].state.solved()
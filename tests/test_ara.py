@@ -0,0 +1,70 @@
+import random
+import time
+
+import pytest
+
+import benchmark
+import ranking
+from problemsearch import ara_search
+from searchstrategies import LinearConflict, Manhattan
+
+from conftest import GOAL, board, is_plan, make_problem
+
+
+@pytest.mark.parametrize("strategy", [Manhattan, LinearConflict])
+def test_converges_to_an_optimal_plan(distances, strategy):
+    for tiles in benchmark.corpus(3, 10):
+        optimal = distances[ranking.rank_tiles(tiles)]
+        reports = []
+        result = ara_search(make_problem(tiles, strategy), time_budget_s=60,
+                            on_solution=lambda path, bound, elapsed:
+                            reports.append((path, bound)))
+        assert result is not None
+        assert len(result[0]) - 1 == optimal
+        assert reports[-1][1] == 1.0
+        assert result[3] == 1.0
+        bounds = [bound for (_, bound) in reports]
+        costs = [len(path) - 1 for (path, _) in reports]
+        assert bounds == sorted(bounds, reverse=True)
+        assert costs == sorted(costs, reverse=True)
+        for (path, bound) in reports:
+            # Every reported bound holds
+            assert is_plan(path)
+            assert bound >= 1.0
+            assert len(path) - 1 <= bound * optimal + 1e-9
+
+
+def test_initial_goal():
+    result = ara_search(make_problem(GOAL))
+    assert result is not None
+    assert len(result[0]) == 1
+
+
+def test_short_budget_gives_a_plan_or_none():
+    reports = []
+    tiles = benchmark.corpus(4, 1)[0]
+    result = ara_search(make_problem(tiles), time_budget_s=0.05,
+                        on_solution=lambda path, bound, elapsed:
+                        reports.append(bound))
+    if result is None:
+        assert not reports
+    else:
+        assert is_plan(result[0])
+        assert all(bound >= 1.0 for bound in reports)
+        assert result[3] == reports[-1]
+
+
+def test_budget_holds_between_passes():
+    # A high first weight finds a plan fast and leaves a frontier of
+    # millions of 5x5 states, which took seconds to reorder before
+    tiles = tuple(board(tuple(range(1, 25)) + (None,))
+                  .random_tiles(random.Random(0)))
+    reports = []
+    started = time.perf_counter()
+    result = ara_search(make_problem(tiles), time_budget_s=1.0, weight=50.0,
+                        on_solution=lambda path, bound, elapsed:
+                        reports.append(bound))
+    assert time.perf_counter() - started < 1.0 + 0.5
+    if result is not None:
+        assert is_plan(result[0])
+        assert result[3] == reports[-1]
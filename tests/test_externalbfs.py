@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import benchmark
+import externalbfs
+import ranking
+from basicsearch_lib02.tileboard import TileBoard
+from distancetable import DistanceTable
+
+from conftest import GOAL, board
+
+
+def test_full_search_matches_the_distance_table(tmp_path, distances):
+    goal = TileBoard(8, force_state=list(GOAL))
+    distance_file = str(tmp_path / "eight.bfs")
+    workdir = str(tmp_path / "work")
+    # Small buffers and fan-in force many runs and several merge passes
+    search = externalbfs.ExternalBFS(3, workdir, buffer_states=500, fan_in=2)
+    counts = search.run([goal], distance_file)
+    assert sum(counts) == ranking.state_count(3)
+    assert counts == [distances.count(depth) for depth in range(len(counts))]
+    with open(distance_file, "rb") as f:
+        data = f.read()
+    assert externalbfs.read_header(data) == 3
+    assert data[externalbfs.HEADER.size:] == \
+        bytes(depth + 1 for depth in distances)
+    assert externalbfs.depth_table(data) == distances
+    # The file can stand in for a distancetable file
+    table = DistanceTable.load(distance_file)
+    for tiles in benchmark.corpus(3, 5):
+        start = board(tiles)
+        actions = table.solve(start)
+        assert len(actions) == distances[ranking.rank_tiles(tiles)]
+    # Only the last layer file remains, runs and merges are removed
+    assert os.listdir(workdir) == ["layer-%d.bin" % (len(counts) - 1)]
+
+
+def test_max_depth_leaves_other_states_unreached(tmp_path, distances):
+    goal = TileBoard(8, force_state=list(GOAL))
+    distance_file = str(tmp_path / "eight.bfs")
+    workdir = str(tmp_path / "work")
+    counts = externalbfs.external_bfs(goal, workdir, max_depth=5,
+                                      distance_file=distance_file)
+    assert counts == [distances.count(depth) for depth in range(6)]
+    assert os.listdir(workdir) == ["layer-5.bin"]
+    with open(distance_file, "rb") as f:
+        data = f.read()
+    assert len(data) == externalbfs.HEADER.size + ranking.state_count(3)
+    assert sum(1 for value in data[externalbfs.HEADER.size:] if value) == \
+        sum(counts)
+    assert externalbfs.depth_of(data, GOAL) == 0
+    assert externalbfs.depth_of(data, (1, 2, 3, 4, 5, 6, None, 7, 8)) == 2
+    assert externalbfs.depth_of(data, (8, 7, 6, 5, 4, 3, 2, 1, None)) is None
+    # A partial search is no distance table
+    with pytest.raises(ValueError):
+        DistanceTable.load(distance_file)
+
+
+def test_keep_keeps_every_layer(tmp_path):
+    goal = TileBoard(3, force_state=[1, 2, 3, None])
+    counts = externalbfs.ExternalBFS(2, str(tmp_path)).run([goal], keep=True)
+    assert sum(counts) == ranking.state_count(2)
+    assert sorted(os.listdir(str(tmp_path))) == \
+        sorted("layer-%d.bin" % depth for depth in range(len(counts)))
+
+
+def test_several_starts(tmp_path, distances):
+    goal = TileBoard(8, force_state=list(GOAL))
+    starts = [goal.move(action) for action in goal.get_actions()]
+    counts = externalbfs.external_bfs(starts, str(tmp_path), max_depth=1)
+    assert counts == [len(starts), 1 + distances.count(2)]
+
+
+def test_fan_in_must_merge():
+    with pytest.raises(ValueError):
+        externalbfs.ExternalBFS(3, ".", fan_in=1)
+
+
+def test_other_files_are_not_distance_files(tmp_path, distances):
+    with pytest.raises(ValueError):
+        externalbfs.read_header(bytes(distances))
+    with pytest.raises(ValueError):
+        externalbfs.depth_table(bytes(distances))
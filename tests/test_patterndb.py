@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+import pytest
+
+import benchmark
+import ranking
+from patterndb import AdditivePatternDatabase, PatternTable
+from problemsearch import graph_search
+from searchstrategies import PatternDatabase
+
+from conftest import GOAL, board, is_plan, make_problem, neighbors
+
+
+def test_admissible_and_consistent_on_the_8_puzzle(distances, database):
+    for rank in range(ranking.state_count(3)):
+        tiles = ranking.unrank_tiles(rank, 3)
+        h = database.h(tiles)
+        assert h <= distances[rank]
+        for child in neighbors(tiles, 3):
+            assert abs(h - database.h(child)) <= 1
+
+
+def test_goal_is_zero(database):
+    assert database.h(GOAL) == 0
+
+
+def test_pattern_table_ignores_the_blank():
+    # Placements are ranked over the pattern tiles only
+    table = PatternTable(4, (1, 2, 3))
+    table.build()
+    assert table.size == 16 * 15 * 14
+    assert len(table.table) == table.size
+    assert table.lookup(list(range(-1, 15))) == 0
+    assert max(table.table) < 255
+
+
+def test_plans_are_optimal(distances, database):
+    PatternDatabase.use(database)
+    for tiles in benchmark.corpus(3):
+        (path, _, _) = graph_search(make_problem(tiles, PatternDatabase))
+        assert is_plan(path)
+        assert len(path) - 1 == distances[ranking.rank_tiles(tiles)]
+
+
+def test_save_and_load(tmp_path, database):
+    filename = str(tmp_path / "eight.npdb")
+    database.save(filename)
+    loaded = AdditivePatternDatabase.load(filename)
+    assert [t.pattern for t in loaded.tables] == \
+        [t.pattern for t in database.tables]
+    assert [bytes(t.table) for t in loaded.tables] == \
+        [bytes(t.table) for t in database.tables]
+
+
+def test_multiple_goals_are_rejected(database):
+    PatternDatabase.use(database)
+    start = board(GOAL, multiple_solutions=True)
+    assert len(start.goals) > 1
+    with pytest.raises(ValueError):
+        PatternDatabase.h(SimpleNamespace(state=start))
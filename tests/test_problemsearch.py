@@ -0,0 +1,227 @@
+import pytest
+
+import benchmark
+import ranking
+from explored import Explored, compact_explored
+from problemsearch import (beam_search, bidirectional_search, graph_search,
+                           ida_search)
+from searchstats import SearchStats
+from searchstrategies import BreadthFirst, LinearConflict, Manhattan
+
+from conftest import is_plan, make_problem
+
+
+class Erratic:
+    "Admissible but not consistent:  Manhattan on some boards, 0 on others"
+    g = Manhattan.g
+
+    @classmethod
+    def h(cls, searchnode):
+        state = searchnode.state
+        if ranking.rank_tiles(state.tiles) % 3:
+            return Manhattan.evaluate(state)
+        return 0
+
+
+class CountingExplored(Explored):
+    "Explored set that remembers every state added"
+
+    def __init__(self):
+        super().__init__()
+        self.added = []
+
+    def add(self, state):
+        self.added.append(state)
+        super().add(state)
+
+
+def optimal_length(distances, tiles):
+    return distances[ranking.rank_tiles(tiles)]
+
+
+def shallow(distances, count=10, depth=12):
+    "count 8-puzzle boards at most depth moves from the goal"
+    boards = []
+    for rank in range(0, len(distances), 101):
+        if distances[rank] <= depth:
+            boards.append(ranking.unrank_tiles(rank, 3))
+            if len(boards) == count:
+                return boards
+
+
+def test_breadth_first_is_optimal(distances):
+    for tiles in shallow(distances):
+        (path, _, _) = graph_search(make_problem(tiles, BreadthFirst))
+        assert is_plan(path)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+
+
+@pytest.mark.parametrize("strategy", [Manhattan, LinearConflict])
+def test_astar_is_optimal(distances, strategy):
+    for tiles in benchmark.corpus(3, 10):
+        (path, explored, _) = graph_search(make_problem(tiles, strategy))
+        assert is_plan(path)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+        assert explored > 0
+
+
+def test_states_are_closed_once_on_expansion():
+    for tiles in benchmark.corpus(3, 10):
+        closed = CountingExplored()
+        stats = SearchStats(timing=False)
+        graph_search(make_problem(tiles), explored=closed, stats=stats)
+        assert len(closed.added) == len(set(closed.added))
+        assert len(closed.added) == stats.expansions
+        assert stats.duplicates > 0
+        assert stats.reopenings == 0
+
+
+def test_reopening_keeps_inconsistent_heuristics_optimal(distances):
+    reopenings = 0
+    for tiles in benchmark.corpus(3, 6):
+        stats = SearchStats(timing=False)
+        (path, _, _) = graph_search(make_problem(tiles, Erratic),
+                                    reopen=True, stats=stats)
+        assert is_plan(path)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+        reopenings += stats.reopenings
+    assert reopenings > 0
+
+
+def test_compact_explored_gives_the_same_search():
+    for tiles in benchmark.corpus(3, 5):
+        (path, explored, _) = graph_search(make_problem(tiles))
+        (other, other_explored, _) = graph_search(
+            make_problem(tiles), explored=compact_explored(3))
+        assert len(other) == len(path)
+        assert other_explored == explored
+
+
+def test_solved_start():
+    (path, explored, _) = graph_search(make_problem(
+        (1, 2, 3, 4, 5, 6, 7, 8, None)))
+    assert len(path) == 1
+    assert explored == 0
+
+
+@pytest.mark.parametrize("strategy", [Manhattan, LinearConflict])
+def test_packed_search_is_optimal(distances, strategy):
+    for tiles in benchmark.corpus(3, 10):
+        stats = SearchStats(timing=False)
+        (path, explored, _) = graph_search(make_problem(tiles, strategy),
+                                           packed=True, stats=stats)
+        assert is_plan(path)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+        assert explored == stats.expansions > 0
+
+
+def test_packed_search_reopens(distances):
+    for tiles in benchmark.corpus(3, 3):
+        (path, _, _) = graph_search(make_problem(tiles, Erratic),
+                                    packed=True, reopen=True)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+
+
+def test_packed_search_on_the_15_puzzle():
+    for tiles in benchmark.corpus(4, 2):
+        (path, _, _) = graph_search(make_problem(tiles, LinearConflict))
+        (packed, _, _) = graph_search(make_problem(tiles, LinearConflict),
+                                      packed=True)
+        assert is_plan(packed)
+        assert len(packed) == len(path)
+
+
+@pytest.mark.parametrize("strategy", [Manhattan, LinearConflict])
+def test_ida_search_is_optimal(distances, strategy):
+    for tiles in benchmark.corpus(3, 10):
+        (path, explored, _) = ida_search(make_problem(tiles, strategy))
+        assert is_plan(path)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+        assert explored > 0
+
+
+def test_ida_search_on_the_15_puzzle():
+    for tiles in benchmark.corpus(4, 2):
+        (path, _, _) = graph_search(make_problem(tiles, LinearConflict))
+        (deepened, _, _) = ida_search(make_problem(tiles, LinearConflict))
+        assert is_plan(deepened)
+        assert len(deepened) == len(path)
+
+
+def test_ida_search_solved_start():
+    (path, _, _) = ida_search(make_problem((1, 2, 3, 4, 5, 6, 7, 8, None)))
+    assert len(path) == 1
+
+
+@pytest.mark.parametrize("strategy", [BreadthFirst, Manhattan])
+def test_bidirectional_search_is_optimal(distances, strategy):
+    for tiles in benchmark.corpus(3, 10):
+        stats = SearchStats(timing=False)
+        (path, explored, _) = graph_search(make_problem(tiles, strategy),
+                                           bidirectional=True, stats=stats)
+        assert is_plan(path)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+        assert explored == stats.expansions > 0
+        assert stats.generations > stats.expansions
+
+
+def test_bidirectional_search_solved_start():
+    (path, explored, _) = bidirectional_search(
+        make_problem((1, 2, 3, 4, 5, 6, 7, 8, None)))
+    assert len(path) == 1
+    assert explored == 0
+
+
+@pytest.mark.parametrize("options", [{"packed": True}, {"symmetric": True},
+                                     {"reopen": True},
+                                     {"explored": Explored()}])
+def test_bidirectional_search_rejects_other_options(options):
+    with pytest.raises(ValueError):
+        graph_search(make_problem(benchmark.corpus(3, 1)[0]),
+                     bidirectional=True, **options)
+
+
+def test_beam_search_finds_valid_plans(distances):
+    for tiles in benchmark.corpus(3):
+        stats = SearchStats(timing=False)
+        result = beam_search(make_problem(tiles, LinearConflict), width=50,
+                             stats=stats)
+        assert result is not None
+        (path, explored, _) = result
+        assert is_plan(path)
+        assert len(path) - 1 >= optimal_length(distances, tiles)
+        assert explored == stats.expansions
+        assert stats.peak_frontier <= 50
+
+
+def test_wide_beams_are_breadth_first(distances):
+    # A beam wider than any depth of the 8-puzzle keeps every state
+    for tiles in shallow(distances):
+        (path, _, _) = beam_search(make_problem(tiles), width=1 << 16)
+        assert len(path) - 1 == optimal_length(distances, tiles)
+
+
+def test_beam_search_is_deterministic():
+    tiles = benchmark.corpus(4, 1)[0]
+    plans = [beam_search(make_problem(tiles), width=20)[0][-1].solution()
+             for _ in range(2)]
+    assert plans[0] == plans[1]
+
+
+def test_beam_search_fails_past_max_depth(distances):
+    tiles = benchmark.corpus(3, 1)[0]
+    optimal = optimal_length(distances, tiles)
+    assert beam_search(make_problem(tiles), max_depth=optimal - 1) is None
+    with pytest.raises(ValueError):
+        beam_search(make_problem(tiles), width=0)
+
+
+def test_observed_and_unobserved_searches_agree():
+    for tiles in benchmark.corpus(3, 5):
+        (path, explored, _) = graph_search(make_problem(tiles))
+        stats = SearchStats()
+        (observed, observed_explored, _) = graph_search(make_problem(tiles),
+                                                        stats=stats)
+        assert observed_explored == explored == stats.expansions
+        assert len(observed) == len(path)
+        assert stats.times["heuristic"] > 0
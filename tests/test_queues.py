@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from basicsearch_lib02.queues import PriorityQueue
+
+
+def drain(queue):
+    return [queue.pop() for _ in range(len(queue))]
+
+
+def test_pops_in_priority_order():
+    rng = random.Random(2)
+    values = [rng.randrange(1000) for _ in range(500)]
+    queue = PriorityQueue()
+    queue.extend(values)
+    assert len(queue) == len(set(values))
+    assert drain(queue) == sorted(set(values))
+
+
+def test_max_order():
+    queue = PriorityQueue(order=max)
+    queue.extend([3, 1, 4, 5, 9, 2, 6])
+    assert drain(queue) == [9, 6, 5, 4, 3, 2, 1]
+
+
+def test_equal_priorities_are_first_in_first_out():
+    queue = PriorityQueue(f=lambda item: item[0])
+    items = [(priority, order) for order in range(20)
+             for priority in (2, 1, 3)]
+    queue.extend(items)
+    assert drain(queue) == sorted(items)
+    queue = PriorityQueue(order=max, f=lambda item: item[0])
+    queue.extend(items)
+    assert drain(queue) == sorted(items, key=lambda item: (-item[0],
+                                                           item[1]))
+
+
+def test_decrease_key_keeps_the_better_item():
+    # Items with the same key are the same state reached at different costs
+    queue = PriorityQueue(f=lambda item: item[1], key=lambda item: item[0])
+    queue.extend([("a", 5), ("b", 3), ("c", 4)])
+    queue.append(("a", 1))
+    assert len(queue) == 3
+    assert queue["a", 0] == ("a", 1)
+    queue.append(("a", 7))
+    assert queue["a", 0] == ("a", 1)
+    # An equal priority does not replace the queued item either
+    queue.append(("c", 4))
+    assert drain(queue) == [("a", 1), ("b", 3), ("c", 4)]
+
+
+def test_decrease_key_on_a_large_heap():
+    rng = random.Random(5)
+    best = {}
+    queue = PriorityQueue(f=lambda item: item[1], key=lambda item: item[0])
+    for _ in range(3000):
+        item = (rng.randrange(300), rng.randrange(10000))
+        queue.append(item)
+        best[item[0]] = min(best.get(item[0], item[1]), item[1])
+    drained = drain(queue)
+    assert sorted(drained) == sorted(best.items())
+    assert [cost for (_, cost) in drained] == sorted(best.values())
+
+
+def test_membership_lookup_and_deletion():
+    queue = PriorityQueue()
+    queue.extend(range(10))
+    assert 3 in queue
+    assert 10 not in queue
+    assert queue[4] == 4
+    assert queue[10] is None
+    del queue[4]
+    del queue[10]
+    assert 4 not in queue
+    assert queue.peek() == 0
+    del queue[0]
+    assert drain(queue) == [1, 2, 3, 5, 6, 7, 8, 9]
+
+
+def test_empty_queue():
+    queue = PriorityQueue()
+    with pytest.raises(IndexError):
+        queue.pop()
+    with pytest.raises(IndexError):
+        queue.peek()
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import ranking
+from npuzzle import NPuzzle
+
+
+def test_unrank_rank_is_a_bijection_on_the_8_puzzle():
+    boards = set()
+    for rank in range(ranking.state_count(3)):
+        tiles = ranking.unrank_tiles(rank, 3)
+        assert ranking.rank_tiles(tiles) == rank
+        boards.add(tiles)
+    assert len(boards) == ranking.state_count(3)
+
+
+def test_unranked_boards_are_solvable():
+    template = NPuzzle(8).initial
+    for rank in range(0, ranking.state_count(3), 97):
+        board = ranking.unrank(rank, template)
+        assert board.solvable(board.state_tuple())
+
+
+@pytest.mark.parametrize("boardsize", [2, 4, 5])
+def test_random_boards_round_trip(boardsize):
+    rng = random.Random(boardsize)
+    n = boardsize * boardsize - 1
+    for _ in range(200):
+        board = NPuzzle(n, rng=rng).initial
+        rank = ranking.rank(board)
+        assert 0 <= rank < ranking.state_count(boardsize)
+        assert ranking.unrank(rank, board).state_tuple() == \
+            board.state_tuple()
+
+
+@pytest.mark.parametrize("boardsize", [3, 4])
+def test_boards_of_the_other_parity_are_rejected(boardsize):
+    n = boardsize * boardsize - 1
+    tiles = list(range(1, n + 1)) + [None]
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    with pytest.raises(ValueError):
+        ranking.rank_tiles(tiles)
+
+
+def test_out_of_range_rank_is_rejected():
+    with pytest.raises(ValueError):
+        ranking.unrank_tiles(ranking.state_count(3), 3)
@@ -0,0 +1,141 @@
+import functools
+import sqlite3
+
+import benchmark
+import ranking
+import symmetry
+from problemsearch import beam_search, graph_search
+from solutioncache import SolutionCache, encode_plan
+from searchstrategies import DepthFirst, Manhattan
+
+from conftest import board, is_plan, make_problem
+
+
+def solves(tiles, actions):
+    "Do actions lead from tiles to the goal?"
+    state = board(tiles)
+    for action in actions:
+        state = state.move(action)
+    return state.solved()
+
+
+def test_second_solve_comes_from_the_cache(distances):
+    cache = SolutionCache()
+    tiles = benchmark.corpus(3, 1)[0]
+    (path, explored, _) = cache.solve(make_problem(tiles))
+    assert explored > 0
+    (cached, explored, _) = cache.solve(make_problem(tiles))
+    assert explored == 0
+    assert is_plan(cached)
+    assert len(cached) == len(path)
+    assert len(path) - 1 == distances[ranking.rank_tiles(tiles)]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_mirror_image_shares_the_entry():
+    cache = SolutionCache()
+    for tiles in benchmark.corpus(3, 5):
+        mirrored = symmetry.mirror_tiles(tiles, 3)
+        (path, _, _) = cache.solve(make_problem(tiles))
+        actions = cache.get(board(mirrored))
+        assert actions is not None
+        assert len(actions) == len(path) - 1
+        assert solves(mirrored, actions)
+    assert len(cache) == 5
+
+
+def test_least_recently_used_plan_is_evicted():
+    cache = SolutionCache(capacity=2)
+    (first, second, third) = benchmark.corpus(3, 3)
+    for tiles in (first, second):
+        cache.solve(make_problem(tiles))
+    cache.get(board(first))
+    cache.solve(make_problem(third))
+    assert len(cache) == 2
+    assert cache.get(board(first)) is not None
+    assert cache.get(board(second)) is None
+    assert cache.get(board(third)) is not None
+
+
+def test_plans_survive_reopening(tmp_path):
+    filename = str(tmp_path / "plans.sqlite")
+    tiles = benchmark.corpus(3, 1)[0]
+    with SolutionCache(filename) as cache:
+        (path, _, _) = cache.solve(make_problem(tiles))
+    with SolutionCache(filename, capacity=1) as cache:
+        assert len(cache) == 0
+        actions = cache.get(board(tiles), optimal=True)
+        assert actions is not None
+        assert len(actions) == len(path) - 1
+        assert solves(tiles, actions)
+        # The mirror image is answered from the file too
+        mirrored = symmetry.mirror_tiles(tiles, 3)
+        assert solves(mirrored, cache.get(board(mirrored)))
+
+
+def test_evicted_plans_are_read_back_from_the_file(tmp_path):
+    with SolutionCache(str(tmp_path / "plans.sqlite"), capacity=1) as cache:
+        instances = benchmark.corpus(3, 3)
+        for tiles in instances:
+            cache.solve(make_problem(tiles))
+        assert len(cache) == 1
+        for tiles in instances:
+            assert solves(tiles, cache.get(board(tiles)))
+
+
+def test_plans_that_may_not_be_optimal_are_kept_apart(distances):
+    cache = SolutionCache()
+    tiles = benchmark.corpus(3, 1)[0]
+    optimal = distances[ranking.rank_tiles(tiles)]
+    beam = functools.partial(beam_search, width=2)
+    (path, _, _) = cache.solve(make_problem(tiles), search=beam)
+    assert len(path) - 1 > optimal
+    assert cache.get(board(tiles), optimal=True) is None
+    # A search that is not optimal may use the plan
+    (_, explored, _) = cache.solve(make_problem(tiles), search=beam)
+    assert explored == 0
+    # An optimal search does not, and its plan replaces the other
+    (path, explored, _) = cache.solve(make_problem(tiles))
+    assert explored > 0
+    assert len(path) - 1 == optimal
+    assert len(cache.get(board(tiles), optimal=True)) == optimal
+    (_, explored, _) = cache.solve(make_problem(tiles), search=beam)
+    assert explored == 0
+    cache.put(board(tiles), path[-1].solution() * 3, optimal=False)
+    assert len(cache.get(board(tiles))) == optimal
+
+
+def test_optimality_is_inferred_from_the_search_and_heuristic():
+    cache = SolutionCache()
+    tiles = benchmark.corpus(3, 1)[0]
+    cache.solve(make_problem(tiles, DepthFirst), search=functools.partial(
+        beam_search, width=2))
+    assert cache.get(board(tiles), optimal=True) is None
+    cache.solve(make_problem(tiles, Manhattan), search=graph_search)
+    assert cache.get(board(tiles), optimal=True) is not None
+
+
+def test_files_without_the_optimal_column_are_upgraded(tmp_path):
+    filename = str(tmp_path / "plans.sqlite")
+    tiles = (1, 2, 3, 4, 5, 6, 7, None, 8)
+    database = sqlite3.connect(filename)
+    database.execute("CREATE TABLE solutions "
+                     "(state TEXT PRIMARY KEY, plan TEXT NOT NULL)")
+    (key, mirrored) = SolutionCache().key(board(tiles))
+    action = [0, 1]
+    if mirrored:
+        action = symmetry.mirror_action(action)
+    database.execute("INSERT INTO solutions VALUES (?, ?)",
+                     (key, encode_plan([action])))
+    database.commit()
+    database.close()
+    with SolutionCache(filename) as cache:
+        assert cache.get(board(tiles), optimal=True) is None
+        assert solves(tiles, cache.get(board(tiles)))
+
+
+def test_multiple_goal_boards_have_their_own_entries():
+    cache = SolutionCache()
+    tiles = (1, 2, 3, 4, 5, 6, 7, None, 8)
+    cache.put(board(tiles), [[0, 1]], optimal=True)
+    assert cache.get(board(tiles, multiple_solutions=True)) is None
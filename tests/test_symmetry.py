@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+import benchmark
+import ranking
+import symmetry
+from basicsearch_lib02.tileboard import pack
+from problemsearch import graph_search, mirror_max_h
+from searchstrategies import LinearConflict, Manhattan, PatternDatabase
+
+from conftest import GOAL, board, is_plan, make_problem
+
+
+def test_mirror_is_an_involution_fixing_the_goal():
+    assert symmetry.mirror_tiles(GOAL, 3) == GOAL
+    for tiles in benchmark.corpus(4):
+        mirrored = symmetry.mirror_tiles(tiles, 4)
+        assert symmetry.mirror_tiles(mirrored, 4) == tiles
+        assert symmetry.mirror_packed(pack(tiles, 4), 4) == \
+            pack(mirrored, 4)
+
+
+def test_mirror_images_are_the_same_distance_from_the_goal(distances):
+    for rank in range(0, ranking.state_count(3), 7):
+        tiles = ranking.unrank_tiles(rank, 3)
+        mirrored = symmetry.mirror_tiles(tiles, 3)
+        assert distances[ranking.rank_tiles(mirrored)] == distances[rank]
+
+
+def test_mirrored_moves_commute_with_mirroring():
+    for tiles in benchmark.corpus(3, 5):
+        original = board(tiles)
+        mirrored = board(symmetry.mirror_tiles(tiles, 3))
+        for action in original.get_actions():
+            moved = original.move(action).state_tuple()
+            assert mirrored.move(symmetry.mirror_action(action)) \
+                .state_tuple() == symmetry.mirror_tiles(moved, 3)
+
+
+def test_canonical_forms_are_shared_by_mirror_images():
+    for boardsize in (3, 4, 5):
+        for tiles in benchmark.corpus(boardsize):
+            mirrored = symmetry.mirror_tiles(tiles, boardsize)
+            canonical = symmetry.canonical_tiles(tiles, boardsize)
+            assert canonical == \
+                symmetry.canonical_tiles(mirrored, boardsize)
+            assert canonical in (tiles, mirrored)
+            (packed, _) = symmetry.canonical(tiles, boardsize)
+            assert pack(canonical, boardsize) == packed
+            assert symmetry.canonical_packed(
+                pack(tiles, boardsize), boardsize) == packed
+            assert symmetry.canonical_packed(
+                pack(mirrored, boardsize), boardsize) == packed
+
+
+def test_boards_that_are_their_own_mirror_image():
+    assert symmetry.canonical_tiles(GOAL, 3) == GOAL
+    assert symmetry.canonical_packed(pack(GOAL, 3), 3) == pack(GOAL, 3)
+
+
+def test_mirror_max_h(database):
+    PatternDatabase.use(database)
+    template = board(GOAL)
+    assert mirror_max_h(template, Manhattan.h) == Manhattan.h
+    h = mirror_max_h(template, PatternDatabase.h)
+    for tiles in benchmark.corpus(3):
+        mirrored = symmetry.mirror_tiles(tiles, 3)
+        value = h(SimpleNamespace(state=board(tiles)))
+        assert value == h(SimpleNamespace(state=board(mirrored)))
+        assert value >= PatternDatabase.h(SimpleNamespace(state=board(tiles)))
+
+
+@pytest.mark.parametrize("strategy",
+                         [Manhattan, LinearConflict, PatternDatabase])
+@pytest.mark.parametrize("options", [{}, {"reopen": True},
+                                     {"packed": True},
+                                     {"packed": True, "reopen": True}])
+def test_symmetric_search_is_optimal(distances, database, strategy,
+                                     options):
+    PatternDatabase.use(database)
+    for tiles in benchmark.corpus(3, 8):
+        problem = make_problem(tiles, strategy)
+        (path, _, _) = graph_search(problem, symmetric=True, **options)
+        assert is_plan(path)
+        assert len(path) - 1 == distances[ranking.rank_tiles(tiles)]
+        # The heuristic is restored afterwards
+        assert problem.h == strategy.h
+
+
+def test_symmetric_search_needs_the_blank_last_goal():
+    problem = make_problem(GOAL, multiple_solutions=True)
+    with pytest.raises(ValueError):
+        graph_search(problem, symmetric=True)
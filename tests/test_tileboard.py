@@ -0,0 +1,158 @@
+import collections
+import itertools
+import random
+
+import pytest
+
+from basicsearch_lib02.tileboard import (MutableTileBoard, TileBoard,
+                                         inversion_parity, pack, parity_class,
+                                         random_boards, unpack)
+
+from conftest import GOAL, neighbors
+
+
+def test_move_returns_a_new_board():
+    board = TileBoard(8, force_state=list(GOAL))
+    moved = board.move([-1, 0])
+    assert moved.state_tuple() == (1, 2, 3, 4, 5, None, 7, 8, 6)
+    assert moved.blank == 5
+    assert moved.empty == (1, 2)
+    # The original board is unchanged
+    assert board.state_tuple() == GOAL
+    assert board.solved()
+    assert not moved.solved()
+    assert moved.move([1, 0]) == board
+    assert hash(moved.move([1, 0])) == hash(board)
+
+
+def test_actions_stay_on_the_board():
+    board = TileBoard(8, force_state=list(GOAL))
+    assert sorted(board.get_actions()) == [[-1, 0], [0, -1]]
+    middle = board.move([-1, 0]).move([0, -1])
+    assert len(middle.get_actions()) == 4
+    for action in board.get_actions():
+        assert board.move(action).blank != board.blank
+    with pytest.raises(ValueError):
+        board.move([1, 0])
+    with pytest.raises(ValueError):
+        board.move([0, 1])
+
+
+def test_boards_have_no_instance_dictionary():
+    board = TileBoard(8, force_state=list(GOAL))
+    assert not hasattr(board, "__dict__")
+    with pytest.raises(AttributeError):
+        board.cost = 1
+    assert isinstance(board.tiles, tuple)
+    assert board.get(2, 2) is None
+    assert board.get(0, 1) == 2
+
+
+def test_unsolvable_boards_are_rejected():
+    with pytest.raises(ValueError):
+        TileBoard(8, force_state=[2, 1, 3, 4, 5, 6, 7, 8, None])
+
+
+def test_mutable_board_make_and_unmake():
+    board = TileBoard(8, force_state=list(GOAL))
+    mutable = MutableTileBoard(board)
+    for action in ([-1, 0], [0, -1], [1, 0]):
+        expected = board.move(action)
+        mutable.make(action)
+        assert mutable.freeze() == expected
+        board = expected
+    mutable.unmake([1, 0])
+    assert mutable.state_tuple() == board.move([-1, 0]).state_tuple()
+
+
+def test_pack_round_trip():
+    for boardsize in (3, 4, 5):
+        n = boardsize * boardsize - 1
+        tiles = tuple(range(n, 0, -1)) + (None,)
+        assert unpack(pack(tiles, boardsize), boardsize) == tiles
+
+
+def inversions(values):
+    "Number of inversions, counted pair by pair"
+    return sum(1 for (a, b) in itertools.combinations(values, 2) if a > b)
+
+
+def reachable(boardsize):
+    "Tile tuples reachable from the blank last goal"
+    n = boardsize * boardsize - 1
+    goal = tuple(range(1, n + 1)) + (None,)
+    seen = {goal}
+    layer = [goal]
+    while layer:
+        layer = [child for tiles in layer
+                 for child in neighbors(tiles, boardsize)
+                 if child not in seen and not seen.add(child)]
+    return seen
+
+
+def test_inversion_parity_counts_inversions():
+    rng = random.Random(13)
+    for length in range(1, 16):
+        for _ in range(20):
+            values = list(range(1, length + 1))
+            rng.shuffle(values)
+            assert inversion_parity(values) == inversions(values) % 2
+
+
+@pytest.mark.parametrize("boardsize", [2, 3])
+def test_solvable_is_reachable(boardsize):
+    n = boardsize * boardsize - 1
+    board = TileBoard(n, force_state=list(range(1, n + 1)) + [None])
+    goals = reachable(boardsize)
+    for tiles in itertools.permutations(list(range(1, n + 1)) + [None]):
+        assert board.solvable(tiles) == (tiles in goals)
+        assert (parity_class(tiles, boardsize) ==
+                parity_class(board.tiles, boardsize)) == (tiles in goals)
+
+
+def test_solvable_batch_agrees_with_solvable():
+    rng = random.Random(31)
+    for boardsize in (2, 3, 4):
+        n = boardsize * boardsize - 1
+        board = TileBoard(n, force_state=list(range(1, n + 1)) + [None])
+        rows = []
+        for _ in range(300):
+            tiles = list(range(1, n + 1)) + [None]
+            rng.shuffle(tiles)
+            rows.append(tiles)
+        expected = [board.solvable(tiles) for tiles in rows]
+        result = TileBoard.solvable_batch(
+            [[tile or 0 for tile in tiles] for tiles in rows], chunk=64)
+        assert [bool(value) for value in result] == expected
+        assert any(expected) and not all(expected)
+
+
+def test_solvable_batch_rejects_rows_that_are_not_permutations():
+    rows = [[1, 2, 3, 4, 5, 6, 7, 8, 0],
+            [1, 1, 3, 4, 5, 6, 7, 8, 0],
+            [1, 2, 3, 4, 5, 6, 7, 9, 0]]
+    assert [bool(value) for value in TileBoard.solvable_batch(rows)] == \
+        [True, False, False]
+
+
+def test_random_tiles_are_solvable_and_uniform():
+    board = TileBoard(3, force_state=[1, 2, 3, None])
+    rng = random.Random(14)
+    counts = collections.Counter(tuple(board.random_tiles(rng))
+                                 for _ in range(12000))
+    # Every one of the 12 solvable boards, each about 1000 times
+    assert set(counts) == reachable(2)
+    assert all(800 < count < 1200 for count in counts.values())
+
+
+def test_random_boards_are_reproducible():
+    first = [board.state_tuple()
+             for board in itertools.islice(random_boards(15, seed=7), 50)]
+    second = [board.state_tuple()
+              for board in itertools.islice(random_boards(15, seed=7), 50)]
+    packed = list(itertools.islice(random_boards(15, seed=7, packed=True), 50))
+    assert first == second
+    assert packed == [pack(tiles, 4) for tiles in first]
+    assert len(set(first)) == 50
+    board = TileBoard(15, force_state=list(range(1, 16)) + [None])
+    assert all(board.solvable(tiles) for tiles in first)
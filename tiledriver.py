@@ -1,85 +1,148 @@
-'''
-driver for graph search problem
-
-I promise that the attached assignment is my own work. I recognize that should this not be the case, 
-I will be subject to penalties as outlined in the course syllabus. James Lee
-'''
-
-from statistics import (mean, stdev)  # Only available in Python 3.4 and newer
-
-from npuzzle import NPuzzle
-from basicsearch_lib02.tileboard import TileBoard
-from basicsearch_lib02.timer import Timer
-from searchstrategies import (BreadthFirst, DepthFirst, Manhattan)
-from problemsearch import graph_search
-import collections
-
-
-def driver():
-    timer = Timer()
-    # result dictionary will contain the result for all strategies
-    tableData = {'BreadthFirstSearch': {'PlanLen': [], '# of Nodes': [], 'Elapsed Time': []},
-               'DepthFirstSearch': {'PlanLen': [], '# of Nodes': [], 'Elapsed Time': []},
-               'Manhattan': {'PlanLen': [], '# of Nodes': [], 'Elapsed Time': []}}
-
-    #This is where i linked the class methods from searchStrategies for each search algorithm
-    algoType = {'BreadthFirstSearch': BreadthFirst, 'DepthFirstSearch': DepthFirst, 'Manhattan': Manhattan}
-
-    #This for loop essentially creates a certain amount of Puzzle cases (In this case, 31 puzzles).
-    for puzzleNum in range(31):
-
-        #This for loop will create our 3 by 3 tile and then print out styling code that I put in.
-        for i in range(3, 4):
-            problem = NPuzzle(i * i - 1)
-            print('_______________________________\n')
-            #Print out the problem number for easy use and interaction
-            print(f'       Problem Number {puzzleNum + 1}')
-            #Printing the Initial/Starting state 
-            print('Starting(Initial) State\n', problem.initial)
-            #Printing the goal state. I can't seem to ever get anything inside this so I'm not sure if this is an error.
-            print('Goal States', problem.goals)
-            print('_______________________________\n')
-
-            #In the case of this for loop, it will be testing each search algorithm in the algorithm list I made named algoType.
-            for searchAlgo in algoType:
-                #I have assigned the g and h methods to the one that it is currently using for a specific algorithm.
-                problem.g = algoType[searchAlgo].g
-                problem.h = algoType[searchAlgo].h
-
-                #Tester Print Statements.
-                #print(problem.g)
-                #print(problem.h)
-                #print(algoType[searchAlgo].g)
-                #print(algoType[searchAlgo].g)
-
-                #So we will be using graph_search to start the search based on the current algorithm type we are using. 
-                moves, exploredNodes, time = graph_search(problem, verbose=False) #Set this verbose value to True if you want to see each step.
-
-                #In here we are just inputting in our data that we are collecting while the search algorithm was running and place them in the correct place.
-                tableData[searchAlgo]['PlanLen'].append(len(moves))
-                tableData[searchAlgo]['# of Nodes'].append(exploredNodes)
-                tableData[searchAlgo]['Elapsed Time'].append(time)
-
-                #These 2 print statements are mainly to give an easier time to grade. Can take out if not needed.
-                print(f'Finished {searchAlgo}...')
-            print(f'Finished Problem {puzzleNum + 1}!')
-
-    #This shows total time that it took for all trials to run, then goes on to print each statements data.
-    print(f'\nTotal time to run all trials: {timer.elapsed()}\n')
-    print('\n~~~~~~~~~~~~~~~~~~~Specific Algo Table Data~~~~~~~~~~~~~~~~~~~~~\n')
-
-    #This for loop will loop through each data value type for each search algorithm and display the values that are in there accordingly.
-    for searchAlg in tableData:
-        items = tableData[searchAlg]
-        print(f'        {searchAlg} Data Table \n')
-        for item_searchAlgo in items:
-            print(f'{item_searchAlgo}: ')
-            print(f'    -Mean: {mean(items[item_searchAlgo])}')
-            print(f'    -STDev: {stdev(items[item_searchAlgo])}')
-        print('____________________________________________________')
-
-
-
-# To do:  Run driver() if this is the entry module
-if __name__ == "__main__":
-    driver()
\ No newline at end of file
+'''
+driver for graph search problem
+
+I promise that the attached assignment is my own work. I recognize that should this not be the case, 
+I will be subject to penalties as outlined in the course syllabus. James Lee
+'''
+
+from statistics import (mean, stdev)  # Only available in Python 3.4 and newer
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import random
+
+from npuzzle import NPuzzle
+from basicsearch_lib02.tileboard import TileBoard
+from basicsearch_lib02.timer import Timer
+from searchstrategies import (BreadthFirst, DepthFirst, Manhattan,
+                              LinearConflict, WalkingDistance)
+from problemsearch import (graph_search, beam_search)
+import collections
+
+
+#This is where i linked the class methods from searchStrategies for each search algorithm.
+#It lives at module level so that worker processes can look strategies up by name.
+algoType = {'BreadthFirstSearch': BreadthFirst, 'DepthFirstSearch': DepthFirst, 'Manhattan': Manhattan,
+            'LinearConflict': LinearConflict, 'WalkingDistance': WalkingDistance}
+
+
+def make_problem(seed, n=8):
+    """make_problem(seed, n) - The NPuzzle generated from a given seed.
+    Every job for the same puzzle uses the same seed, so all strategies
+    see the same board no matter which process runs them.  The board is
+    drawn from its own random.Random, the global generator is untouched."""
+    return NPuzzle(n, rng=random.Random(seed))
+
+
+def solve_job(job):
+    """solve_job((puzzleNum, seed, searchAlgo, beamWidth)) - Solve one puzzle
+    with one strategy and return (puzzleNum, searchAlgo, plan length, nodes,
+    time).  If beamWidth is not None, beam_search keeps that many nodes per
+    depth instead of graph_search looking for an optimal plan."""
+    puzzleNum, seed, searchAlgo, beamWidth = job
+    problem = make_problem(seed)
+    #I have assigned the g and h methods to the one that it is currently using for a specific algorithm.
+    problem.g = algoType[searchAlgo].g
+    problem.h = algoType[searchAlgo].h
+    #So we will be using graph_search to start the search based on the current algorithm type we are using.
+    if beamWidth is None:
+        moves, exploredNodes, time = graph_search(problem, verbose=False) #Set this verbose value to True if you want to see each step.
+    else:
+        #Beam search orders each depth by the strategy's h, ties stay in the order they were generated.
+        #It expands a whole depth at once, so strategies that can evaluate many states in one call get to do that.
+        problem.h_batch = getattr(algoType[searchAlgo], 'h_batch', None)
+        result = beam_search(problem, beamWidth, verbose=False)
+        if result is None:
+            #A narrow beam can prune every way to the goal, None marks a puzzle without a plan.
+            return puzzleNum, searchAlgo, None, None, None
+        moves, exploredNodes, time = result
+    return puzzleNum, searchAlgo, len(moves), exploredNodes, time
+
+
+def run_batch(jobs, workers=None):
+    """run_batch(jobs, workers) - Solve a list of jobs (see solve_job) over a
+    pool of worker processes, os.cpu_count() of them if workers is None.
+    Results are returned in the order of jobs.  With workers == 1 the jobs
+    are run one after another in this process."""
+    if workers == 1:
+        return [solve_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(solve_job, jobs))
+
+
+def driver(workers=None, puzzles=31, seed=0, beam_width=None):
+    """driver(workers, puzzles, seed, beam_width) - Solve puzzles random 8
+    puzzles with every strategy in algoType, spreading the (puzzle, strategy)
+    jobs over workers processes, and display statistics.  Puzzle k is
+    generated from seed + k, so runs are repeatable.  With a beam_width,
+    plans come from beam_search of that width and need not be optimal."""
+    timer = Timer()
+
+    # result dictionary will contain the result for all strategies.
+    # Nodes/Sec shows the per node cost of each heuristic next to the number of nodes it needed.
+    tableData = {searchAlgo: {'PlanLen': [], '# of Nodes': [], 'Elapsed Time': [], 'Nodes/Sec': []}
+                 for searchAlgo in algoType}
+
+    #This for loop essentially creates a certain amount of Puzzle cases (In this case, 31 puzzles).
+    jobs = []
+    for puzzleNum in range(puzzles):
+        problem = make_problem(seed + puzzleNum)
+        print('_______________________________\n')
+        #Print out the problem number for easy use and interaction
+        print(f'       Problem Number {puzzleNum + 1}')
+        #Printing the Initial/Starting state 
+        print('Starting(Initial) State\n', problem.initial)
+        print('_______________________________\n')
+
+        #Each search algorithm in the algorithm list I made named algoType gets its own job.
+        for searchAlgo in algoType:
+            jobs.append((puzzleNum, seed + puzzleNum, searchAlgo, beam_width))
+
+    #Results come back in job order, so the table is filled the same way every run.
+    #Puzzles a beam search found no plan for, per strategy.
+    failures = collections.Counter()
+    for puzzleNum, searchAlgo, planLen, exploredNodes, time in run_batch(jobs, workers):
+        if planLen is None:
+            failures[searchAlgo] += 1
+            print(f'No plan for Problem {puzzleNum + 1} {searchAlgo}...')
+            continue
+        #In here we are just inputting in our data that we are collecting while the search algorithm was running and place them in the correct place.
+        tableData[searchAlgo]['PlanLen'].append(planLen)
+        tableData[searchAlgo]['# of Nodes'].append(exploredNodes)
+        tableData[searchAlgo]['Elapsed Time'].append(time)
+        tableData[searchAlgo]['Nodes/Sec'].append(exploredNodes / time if time > 0 else 0)
+
+        #These print statements are mainly to give an easier time to grade. Can take out if not needed.
+        print(f'Finished Problem {puzzleNum + 1} {searchAlgo}...')
+
+    #This shows total time that it took for all trials to run, then goes on to print each statements data.
+    print(f'\nTotal time to run all trials: {timer.elapsed()}\n')
+    print('\n~~~~~~~~~~~~~~~~~~~Specific Algo Table Data~~~~~~~~~~~~~~~~~~~~~\n')
+
+    #This for loop will loop through each data value type for each search algorithm and display the values that are in there accordingly.
+    for searchAlg in tableData:
+        items = tableData[searchAlg]
+        print(f'        {searchAlg} Data Table \n')
+        if failures[searchAlg]:
+            print(f'No plan found for {failures[searchAlg]} puzzles\n')
+        for item_searchAlgo in items:
+            print(f'{item_searchAlgo}: ')
+            #Mean needs one value and STDev two, fewer are left when a beam search fails.
+            if len(items[item_searchAlgo]) > 0:
+                print(f'    -Mean: {mean(items[item_searchAlgo])}')
+            if len(items[item_searchAlgo]) > 1:
+                print(f'    -STDev: {stdev(items[item_searchAlgo])}')
+        print('____________________________________________________')
+
+
+
+# To do:  Run driver() if this is the entry module
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve random 8 puzzles with each search strategy")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU, 1 runs in this process)")
+    parser.add_argument("--puzzles", type=int, default=31, help="number of puzzles")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first puzzle")
+    parser.add_argument("--beam-width", type=int, default=None,
+                        help="use beam search keeping this many nodes per depth (plans may not be optimal)")
+    args = parser.parse_args()
+    driver(args.workers, args.puzzles, args.seed, args.beam_width)
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+vectorized - Heuristic values for many N-puzzle states at once
+
+States are stacked into a NumPy uint8 array, one row per state with 0
+for the blank, and heuristics are computed for every row with array
+operations against precomputed goal coordinate tables.  This pays off
+for wide frontier layers on 4x4 and 5x5 boards, where evaluating states
+one at a time is dominated by interpreter overhead.
+
+NumPy is optional.  When it is not installed, available is False and
+callers should evaluate states one at a time instead.
+"""
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+available = numpy is not None
+
+# boardsize -> (cell rows, cell columns, goal rows, goal columns)
+_coordinates = {}
+
+
+def coordinates(boardsize):
+    """coordinates(boardsize) - Row and column of every cell, and goal row
+    and column of every tile value (index 0, the blank, maps to 0)"""
+    try:
+        return _coordinates[boardsize]
+    except KeyError:
+        pass
+    cells = numpy.arange(boardsize * boardsize)
+    tiles = numpy.maximum(cells - 1, 0)
+    tables = (cells // boardsize, cells % boardsize,
+              tiles // boardsize, tiles % boardsize)
+    _coordinates[boardsize] = tables
+    return tables
+
+
+def stack(states):
+    "stack(states) - uint8 array of the tiles of boards, 0 for the blank"
+    return numpy.array([[tile or 0 for tile in state.state_tuple()]
+                        for state in states], dtype=numpy.uint8)
+
+
+def manhattan(tiles, boardsize):
+    """manhattan(tiles, boardsize) - Manhattan distance of each row of a
+    stack() array"""
+    (rows, cols, goalrows, goalcols) = coordinates(boardsize)
+    distance = numpy.abs(goalrows[tiles] - rows) + \
+        numpy.abs(goalcols[tiles] - cols)
+    distance[tiles == 0] = 0
+    return distance.sum(axis=1)
+
+
+def linear_conflicts(tiles, boardsize):
+    """linear_conflicts(tiles, boardsize) - For each row of a stack()
+    array, the number of tiles that must leave their goal row or column,
+    as in searchstrategies.LinearConflict.line_conflicts"""
+    (rows, cols, goalrows, goalcols) = coordinates(boardsize)
+    goalrow = goalrows[tiles]
+    goalcol = goalcols[tiles]
+    occupied = tiles != 0
+    total = numpy.zeros(len(tiles), dtype=numpy.int64)
+    for line in range(boardsize):
+        for horizontal in (True, False):
+            if horizontal:
+                cells = numpy.arange(line * boardsize, (line + 1) * boardsize)
+                inline = occupied[:, cells] & (goalrow[:, cells] == line)
+                coordinate = goalcol[:, cells]
+            else:
+                cells = numpy.arange(line, boardsize * boardsize, boardsize)
+                inline = occupied[:, cells] & (goalcol[:, cells] == line)
+                coordinate = goalrow[:, cells]
+            # Longest increasing run of goal coordinates among the tiles
+            # that belong to the line, by dynamic programming over cells
+            longest = numpy.zeros(inline.shape, dtype=numpy.int64)
+            for i in range(boardsize):
+                best = numpy.zeros(len(tiles), dtype=numpy.int64)
+                for j in range(i):
+                    before = inline[:, j] & (coordinate[:, j] < coordinate[:, i])
+                    best = numpy.where(before,
+                                       numpy.maximum(best, longest[:, j]),
+                                       best)
+                longest[:, i] = numpy.where(inline[:, i], best + 1, 0)
+            total += inline.sum(axis=1) - longest.max(axis=1)
+    return total